@@ -18,7 +18,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Import settings and database
-from src.core.config import settings
+from src.core.config import get_settings
 from src.core.database import Base
 
 # Import all models so Alembic can detect them
@@ -39,7 +39,7 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Set the SQLAlchemy URL from settings
-config.set_main_option("sqlalchemy.url", settings.get_database_url_sync())
+config.set_main_option("sqlalchemy.url", get_settings().get_database_url_sync())
 
 # Set target metadata for autogenerate
 target_metadata = Base.metadata
@@ -0,0 +1,42 @@
+"""Store crawl task url_hash as raw bytes
+
+Revision ID: 4a0909a0436e
+Revises: fd9b35b4d99e
+Create Date: 2026-10-15 05:56:18.412155
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a0909a0436e'
+down_revision: Union[str, None] = 'fd9b35b4d99e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'crawl_tasks', 'url_hash',
+        existing_type=sa.String(length=32),
+        type_=sa.LargeBinary(length=16),
+        existing_nullable=False,
+        postgresql_using="decode(url_hash, 'hex')",
+        comment='xxh3-128 digest of URL, 16 raw bytes (deduplication)',
+        existing_comment='xxh3-128 hash of URL (deduplication)',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'crawl_tasks', 'url_hash',
+        existing_type=sa.LargeBinary(length=16),
+        type_=sa.String(length=32),
+        existing_nullable=False,
+        postgresql_using="encode(url_hash, 'hex')",
+        comment='xxh3-128 hash of URL (deduplication)',
+        existing_comment='xxh3-128 digest of URL, 16 raw bytes (deduplication)',
+    )
@@ -0,0 +1,106 @@
+"""Store product hashes as raw digests
+
+Revision ID: 971e60906ad8
+Revises: e357a13276b1
+Create Date: 2026-10-15 06:08:38.303922
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+
+
+# revision identifiers, used by Alembic.
+revision: str = '971e60906ad8'
+down_revision: Union[str, None] = 'e357a13276b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+products = sa.table(
+    'products',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.Text),
+    sa.column('url_hash', sa.LargeBinary),
+)
+
+
+# Rows rehashed per executemany UPDATE
+_BATCH_SIZE = 5000
+
+
+def _rehash(hash_fn) -> None:
+    """
+    Recompute url_hash for every existing product.
+
+    Rows are read in id order, _BATCH_SIZE at a time, and each batch is
+    written with one executemany UPDATE.
+    """
+    conn = op.get_bind()
+    update = (
+        products.update()
+        .where(products.c.id == sa.bindparam('b_id'))
+        .values(url_hash=sa.bindparam('b_hash'))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(products.c.id, products.c.url)
+            .where(products.c.id > last_id)
+            .order_by(products.c.id)
+            .limit(_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            update,
+            [{'b_id': row_id, 'b_hash': hash_fn(url.encode('utf-8'))} for row_id, url in rows]
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'products', 'url_hash',
+        existing_type=sa.String(length=64),
+        type_=sa.LargeBinary(length=16),
+        existing_nullable=False,
+        postgresql_using="decode(url_hash, 'hex')",
+        comment='xxh3-128 digest of URL, 16 raw bytes (deduplication)',
+        existing_comment='SHA256 hash of URL (deduplication)',
+    )
+    _rehash(xxhash.xxh3_128_digest)
+    op.alter_column(
+        'products', 'content_hash',
+        existing_type=sa.String(length=64),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=True,
+        postgresql_using="decode(content_hash, 'hex')",
+        comment='BLAKE2b-256 digest of product data, 32 raw bytes (detect changes)',
+        existing_comment='BLAKE2b-256 hash of product data (detect changes)',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'products', 'content_hash',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=64),
+        existing_nullable=True,
+        postgresql_using="encode(content_hash, 'hex')",
+        comment='BLAKE2b-256 hash of product data (detect changes)',
+        existing_comment='BLAKE2b-256 digest of product data, 32 raw bytes (detect changes)',
+    )
+    _rehash(lambda data: hashlib.sha256(data).digest())
+    op.alter_column(
+        'products', 'url_hash',
+        existing_type=sa.LargeBinary(length=16),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="encode(url_hash, 'hex')",
+        comment='SHA256 hash of URL (deduplication)',
+        existing_comment='xxh3-128 digest of URL, 16 raw bytes (deduplication)',
+    )
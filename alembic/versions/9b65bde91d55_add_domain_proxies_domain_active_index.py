@@ -0,0 +1,30 @@
+"""Add domain_proxies (domain_id, is_active) index
+
+Revision ID: 9b65bde91d55
+Revises: 35c0afba121e
+Create Date: 2026-10-15 05:47:32.327162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b65bde91d55'
+down_revision: Union[str, None] = '35c0afba121e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite index for per-domain active proxy lookups; its domain_id
+    # prefix also covers the standalone domain_id index
+    op.create_index('ix_dp_domain_active', 'domain_proxies', ['domain_id', 'is_active'], unique=False)
+    op.drop_index(op.f('ix_domain_proxies_domain_id'), table_name='domain_proxies')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_domain_proxies_domain_id'), 'domain_proxies', ['domain_id'], unique=False)
+    op.drop_index('ix_dp_domain_active', table_name='domain_proxies')
@@ -0,0 +1,54 @@
+"""Store crawl task status as a native enum
+
+Revision ID: ab34c91883cd
+Revises: 550c2e507c51
+Create Date: 2026-10-15 06:00:45.864816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab34c91883cd'
+down_revision: Union[str, None] = '550c2e507c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+crawl_task_status = postgresql.ENUM(
+    'pending', 'queued', 'crawling', 'downloaded', 'queued_parse', 'parsing',
+    'completed', 'failed', 'paused', 'cancelled',
+    name='crawl_task_status'
+)
+
+
+def upgrade() -> None:
+    # The partial index predicate compares status as text; rebuild it
+    # against the enum once the column is converted
+    op.drop_index('ix_tasks_ready', table_name='crawl_tasks', postgresql_where=sa.text("status = 'pending'"))
+    crawl_task_status.create(op.get_bind())
+    op.alter_column(
+        'crawl_tasks', 'status',
+        existing_type=sa.String(length=50),
+        type_=crawl_task_status,
+        existing_nullable=False,
+        postgresql_using='status::crawl_task_status'
+    )
+    op.create_index('ix_tasks_ready', 'crawl_tasks', ['priority', 'scheduled_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_ready', table_name='crawl_tasks', postgresql_where=sa.text("status = 'pending'"))
+    op.alter_column(
+        'crawl_tasks', 'status',
+        existing_type=crawl_task_status,
+        type_=sa.String(length=50),
+        existing_nullable=False,
+        postgresql_using='status::text'
+    )
+    crawl_task_status.drop(op.get_bind())
+    op.create_index('ix_tasks_ready', 'crawl_tasks', ['priority', 'scheduled_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
@@ -0,0 +1,86 @@
+"""Switch crawl task url_hash to xxh3-128
+
+Revision ID: fd9b35b4d99e
+Revises: 6dd932ae28df
+Create Date: 2026-10-15 05:52:41.572819
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fd9b35b4d99e'
+down_revision: Union[str, None] = '6dd932ae28df'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+crawl_tasks = sa.table(
+    'crawl_tasks',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.Text),
+    sa.column('url_hash', sa.String),
+)
+
+
+# Rows rehashed per executemany UPDATE
+_BATCH_SIZE = 5000
+
+
+def _rehash(hash_fn) -> None:
+    """
+    Recompute url_hash for every existing task.
+
+    Rows are read in id order, _BATCH_SIZE at a time, and each batch is
+    written with one executemany UPDATE.
+    """
+    conn = op.get_bind()
+    update = (
+        crawl_tasks.update()
+        .where(crawl_tasks.c.id == sa.bindparam('b_id'))
+        .values(url_hash=sa.bindparam('b_hash'))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(crawl_tasks.c.id, crawl_tasks.c.url)
+            .where(crawl_tasks.c.id > last_id)
+            .order_by(crawl_tasks.c.id)
+            .limit(_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            update,
+            [{'b_id': row_id, 'b_hash': hash_fn(url.encode('utf-8'))} for row_id, url in rows]
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    _rehash(xxhash.xxh3_128_hexdigest)
+    op.alter_column(
+        'crawl_tasks', 'url_hash',
+        existing_type=sa.String(length=64),
+        type_=sa.String(length=32),
+        existing_nullable=False,
+        comment='xxh3-128 hash of URL (deduplication)',
+        existing_comment='SHA256 hash of URL (deduplication)',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'crawl_tasks', 'url_hash',
+        existing_type=sa.String(length=32),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        comment='SHA256 hash of URL (deduplication)',
+        existing_comment='xxh3-128 hash of URL (deduplication)',
+    )
+    _rehash(lambda data: hashlib.sha256(data).hexdigest())
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for running the FastAPI app in production.
+
+Usage:
+    gunicorn src.api.main:app -c gunicorn_conf.py
+
+Each worker process owns its own SQLAlchemy pool; src.core.config reads
+WEB_CONCURRENCY (exported below) to split DB_MAX_CONNECTIONS between them.
+"""
+
+import multiprocessing
+import os
+
+# Worker processes (2 * CPU + 1 unless overridden)
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+
+# Connection handling
+keepalive = 5
+timeout = 60
+graceful_timeout = 30
+
+# Logging
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = "-"
+errorlog = "-"
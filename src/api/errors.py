@@ -0,0 +1,48 @@
+"""
+API error type and handler.
+
+Routes raise ApiError; the registered handler renders it straight into the
+standard error envelope instead of going through HTTPException's detail
+encoding.
+"""
+
+from typing import Any, Optional
+
+from fastapi import Request
+
+from src.api.responses import ORJSONResponse
+
+
+class ApiError(Exception):
+    """
+    Error rendered as {"success": false, "error": {"code", "message"[, "details"]}}.
+
+    Usage:
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {domain_id} not found")
+    """
+
+    __slots__ = ("status_code", "code", "message", "details")
+
+    def __init__(
+        self,
+        status_code: int,
+        code: str,
+        message: str,
+        details: Optional[dict[str, Any]] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.details = details
+
+
+async def api_error_handler(request: Request, exc: ApiError) -> ORJSONResponse:
+    """Render ApiError in the standard error envelope."""
+    error = {"code": exc.code, "message": exc.message}
+    if exc.details is not None:
+        error["details"] = exc.details
+    return ORJSONResponse(
+        {"success": False, "error": error},
+        status_code=exc.status_code
+    )
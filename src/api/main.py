@@ -4,23 +4,34 @@ FastAPI main application entry point.
 Configures the application, registers routes, and provides global exception handling.
 """
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from src.core.config import get_settings
+from src.api.errors import ApiError, api_error_handler
+from src.api.responses import ORJSONResponse
+from src.api.routing import use_trie_router
 from src.api.routes_tasks import router as tasks_router
 from src.api.routes_domains import router as domains_router
 from src.api.routes_proxies import router as proxies_router
 from src.api.routes_domain_proxies import router as domain_proxies_router
 
+settings = get_settings()
+
 # Create FastAPI application
 app = FastAPI(
     title="Crawler API",
     description="Web crawler system for product data extraction",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url="/docs" if settings.api_docs_enabled else None,
+    redoc_url="/redoc" if settings.api_docs_enabled else None,
+    openapi_url="/openapi.json" if settings.api_docs_enabled else None,
+    default_response_class=ORJSONResponse
 )
 
+# Dispatch requests through the segment-trie router
+use_trie_router(app)
+
 # Configure CORS (adjust for production)
 app.add_middleware(
     CORSMiddleware,
@@ -56,11 +67,15 @@ app.include_router(
 )
 
 
+# API error handler (standard error envelope)
+app.add_exception_handler(ApiError, api_error_handler)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -73,26 +88,32 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Static response bodies, serialized once at import time
+HEALTH_BODY = orjson.dumps({
+    "success": True,
+    "data": {
+        "status": "healthy",
+        "version": "1.0.0"
+    }
+})
+
+ROOT_BODY = orjson.dumps({
+    "message": "Crawler API",
+    "version": "1.0.0",
+    "docs": "/docs" if settings.api_docs_enabled else None,
+    "health": "/api/health"
+})
+
+
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
     """Basic health check endpoint."""
-    return {
-        "success": True,
-        "data": {
-            "status": "healthy",
-            "version": "1.0.0"
-        }
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "Crawler API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/api/health"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
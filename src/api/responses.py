@@ -0,0 +1,46 @@
+"""
+Response classes for API endpoints.
+
+Serializes payloads with orjson instead of FastAPI's jsonable_encoder path.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def pagination_info(page: int, per_page: int, total: int) -> dict[str, int]:
+    """Build the "pagination" payload for list endpoints (see PaginationInfo)."""
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "total_pages": (total + per_page - 1) // per_page
+    }
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively (Numeric, Interval)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, timedelta):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Handlers return this directly with a plain dict payload, so FastAPI skips
+    response_model validation and re-encoding. The response_model on the route
+    decorator is kept for OpenAPI documentation only.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
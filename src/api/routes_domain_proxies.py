@@ -4,25 +4,36 @@ Domain-Proxy Management API Routes.
 Endpoints for managing proxy-to-domain mappings and performance tracking.
 """
 
-from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from typing import Optional, Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_async_db
 from src.core.models import Domain, Proxy, DomainProxy
 from src.api.schemas.proxy import (
     DomainProxyAssign,
-    DomainProxyResponse,
-    DomainProxyStatsResponse
+    DomainProxyStatsApiResponse
 )
-from src.api.schemas.response import ApiResponse
+from src.api.schemas.response import DictApiResponse
+from src.api.errors import ApiError
+from src.api.responses import ORJSONResponse, pagination_info
+from src.services.cache_service import cache_swr, invalidate
 
 
 router = APIRouter()
 
 
+def mapping_count(domain_id: int):
+    """Scalar subquery counting a domain's proxy mappings."""
+    return (
+        select(func.count(DomainProxy.id))
+        .where(DomainProxy.domain_id == domain_id)
+        .scalar_subquery()
+    )
+
+
 def calculate_success_rate_percent(success_count: int, failure_count: int) -> float:
     """Calculate success rate percentage."""
     total = success_count + failure_count
@@ -31,11 +42,11 @@ def calculate_success_rate_percent(success_count: int, failure_count: int) -> fl
     return round((success_count / total) * 100, 2)
 
 
-@router.post("", response_model=ApiResponse[dict], status_code=201)
+@router.post("", response_model=DictApiResponse, status_code=201)
 async def assign_proxies_to_domain(
     domain_id: int,
     assignment_data: DomainProxyAssign,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Assign one or more proxies to a domain.
@@ -45,166 +56,157 @@ async def assign_proxies_to_domain(
     - 404: Domain or proxy not found
     - 409: Proxy already assigned to domain
     """
-    # Verify domain exists
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
-    if not domain:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_NOT_FOUND",
-                    "message": f"Domain with ID {domain_id} not found"
-                }
-            }
+    # Verify domain exists and get its current mapping count
+    domain_row = (
+        await db.execute(
+            select(Domain.domain_name, mapping_count(domain_id))
+            .where(Domain.id == domain_id)
         )
+    ).first()
+    if domain_row is None:
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {domain_id} not found")
+    domain_name, existing_proxies = domain_row
 
     # Verify all proxies exist
-    proxies = db.query(Proxy).filter(Proxy.id.in_(assignment_data.proxy_ids)).all()
-    if len(proxies) != len(assignment_data.proxy_ids):
-        found_ids = {p.id for p in proxies}
-        missing_ids = set(assignment_data.proxy_ids) - found_ids
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxies not found: {missing_ids}"
-                }
-            }
-        )
-
-    # Assign proxies
-    assigned_count = 0
-    for proxy_id in assignment_data.proxy_ids:
-        # Check if already assigned
-        existing = db.query(DomainProxy).filter(
-            and_(
-                DomainProxy.domain_id == domain_id,
-                DomainProxy.proxy_id == proxy_id
-            )
-        ).first()
-
-        if not existing:
-            domain_proxy = DomainProxy(
-                domain_id=domain_id,
-                proxy_id=proxy_id,
-                is_active=True,
-                priority=assignment_data.priority,
-                success_count=0,
-                failure_count=0,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(domain_proxy)
-            assigned_count += 1
-
-    db.commit()
-
-    # Get total proxies count
-    total_proxies = db.query(func.count(DomainProxy.id))\
-        .filter(DomainProxy.domain_id == domain_id)\
-        .scalar() or 0
-
-    return ApiResponse(
-        success=True,
-        data={
+    proxy_ids = list(dict.fromkeys(assignment_data.proxy_ids))
+    found_ids = set(
+        (await db.scalars(select(Proxy.id).where(Proxy.id.in_(proxy_ids)))).all()
+    )
+    if len(found_ids) != len(proxy_ids):
+        missing_ids = set(proxy_ids) - found_ids
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxies not found: {missing_ids}")
+
+    # Assign proxies in one statement; existing mappings are skipped by the
+    # unique (domain_id, proxy_id) constraint
+    stmt = insert(DomainProxy).values([
+        {
             "domain_id": domain_id,
-            "domain_name": domain.domain_name,
-            "proxies_assigned": assigned_count,
-            "proxy_ids": assignment_data.proxy_ids,
-            "total_proxies": total_proxies
+            "proxy_id": proxy_id,
+            "is_active": True,
+            "priority": assignment_data.priority,
+            "success_count": 0,
+            "failure_count": 0
+        }
+        for proxy_id in proxy_ids
+    ]).on_conflict_do_nothing(
+        index_elements=["domain_id", "proxy_id"]
+    ).returning(DomainProxy.proxy_id)
+
+    assigned_count = len((await db.execute(stmt)).all())
+    await db.commit()
+
+    await invalidate(f"domain:{domain_id}:*", "domains:list:*")
+
+    total_proxies = existing_proxies + assigned_count
+
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": {
+                "domain_id": domain_id,
+                "domain_name": domain_name,
+                "proxies_assigned": assigned_count,
+                "proxy_ids": assignment_data.proxy_ids,
+                "total_proxies": total_proxies
+            },
+            "message": f"{assigned_count} proxies assigned to domain successfully"
         },
-        message=f"{assigned_count} proxies assigned to domain successfully"
+        status_code=201
     )
 
 
-@router.get("", response_model=ApiResponse[dict])
+@router.get("", response_model=DictApiResponse)
 async def list_domain_proxies(
     domain_id: int,
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     sort_by: str = Query("success_rate", description="Sort field"),
-    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
+    sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(100, ge=1, le=500, description="Results per page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all proxies assigned to a domain with performance stats.
+    Get proxies assigned to a domain with performance stats.
+
+    Sorting, counting, and pagination are done in SQL.
 
     **Returns:**
     - 200: Domain proxies list
     - 404: Domain not found
     """
-    # Verify domain exists
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
-    if not domain:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_NOT_FOUND",
-                    "message": f"Domain with ID {domain_id} not found"
-                }
-            }
-        )
-
-    # Build query
-    query = db.query(DomainProxy)\
-        .options(joinedload(DomainProxy.proxy))\
-        .filter(DomainProxy.domain_id == domain_id)
-
+    # Build filters
+    filters = [DomainProxy.domain_id == domain_id]
     if is_active is not None:
-        query = query.filter(DomainProxy.is_active == is_active)
-
-    domain_proxies = query.all()
-
-    # Build response
-    proxies_list = []
-    for dp in domain_proxies:
-        proxies_list.append(
-            DomainProxyResponse(
-                proxy_id=dp.proxy.id,
-                proxy_url=dp.proxy.proxy_url,
-                proxy_port=dp.proxy.proxy_port,
-                country_code=dp.proxy.country_code,
-                is_active=dp.is_active,
-                priority=dp.priority,
-                success_count=dp.success_count,
-                failure_count=dp.failure_count,
-                success_rate_percent=calculate_success_rate_percent(dp.success_count, dp.failure_count),
-                avg_response_time_ms=dp.avg_response_time_ms,
-                last_used_at=dp.last_used_at
+        filters.append(DomainProxy.is_active == is_active)
+
+    # Verify domain exists and count its total and active proxies in one
+    # statement (no row when the domain is missing)
+    counts = (
+        await db.execute(
+            select(
+                Domain.domain_name,
+                func.count(DomainProxy.id),
+                func.count(DomainProxy.id).filter(DomainProxy.is_active == True)
             )
+            .outerjoin(DomainProxy, and_(*filters))
+            .where(Domain.id == domain_id)
+            .group_by(Domain.id)
         )
+    ).first()
+    if counts is None:
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {domain_id} not found")
+    domain_name, total_proxies, active_proxies = counts
+
+    # Select only the rendered columns, labelled with their response keys
+    query = select(
+        Proxy.id.label("proxy_id"),
+        Proxy.proxy_url,
+        Proxy.proxy_port,
+        Proxy.country_code,
+        DomainProxy.is_active,
+        DomainProxy.priority,
+        DomainProxy.success_count,
+        DomainProxy.failure_count,
+        DomainProxy.success_rate_percent,
+        DomainProxy.avg_response_time_ms,
+        DomainProxy.last_used_at
+    ).join(Proxy, DomainProxy.proxy_id == Proxy.id).where(and_(*filters))
 
     # Sort
     if sort_by == "success_rate":
-        proxies_list.sort(
-            key=lambda x: x.success_rate_percent,
-            reverse=(sort_order == "desc")
+        sort_column = DomainProxy.success_rate_percent
+        query = query.order_by(
+            sort_column.desc() if sort_order == "desc" else sort_column.asc(),
+            DomainProxy.id
         )
+    else:
+        query = query.order_by(DomainProxy.id)
 
-    # Count active proxies
-    active_proxies = sum(1 for p in proxies_list if p.is_active)
+    # Apply pagination
+    offset = (page - 1) * per_page
+    rows = (await db.execute(query.offset(offset).limit(per_page))).all()
 
-    return ApiResponse(
-        success=True,
-        data={
+    # Build response
+    proxies_list = [dict(row._mapping) for row in rows]
+
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "domain_id": domain_id,
-            "domain_name": domain.domain_name,
-            "total_proxies": len(proxies_list),
+            "domain_name": domain_name,
+            "total_proxies": total_proxies,
             "active_proxies": active_proxies,
             "proxies": proxies_list
-        }
-    )
+        },
+        "pagination": pagination_info(page, per_page, total_proxies)
+    })
 
 
-@router.delete("/{proxy_id}", response_model=ApiResponse[dict])
+@router.delete("/{proxy_id}", response_model=DictApiResponse)
 async def remove_proxy_from_domain(
     domain_id: int,
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove proxy assignment from domain.
@@ -213,49 +215,48 @@ async def remove_proxy_from_domain(
     - 200: Proxy removed successfully
     - 404: Mapping not found
     """
-    domain_proxy = db.query(DomainProxy).filter(
-        and_(
-            DomainProxy.domain_id == domain_id,
-            DomainProxy.proxy_id == proxy_id
+    mapping_row = (
+        await db.execute(
+            select(DomainProxy.id, mapping_count(domain_id)).where(
+                and_(
+                    DomainProxy.domain_id == domain_id,
+                    DomainProxy.proxy_id == proxy_id
+                )
+            )
         )
     ).first()
 
-    if not domain_proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "MAPPING_NOT_FOUND",
-                    "message": f"Proxy {proxy_id} is not assigned to domain {domain_id}"
-                }
-            }
+    if mapping_row is None:
+        raise ApiError(
+            404,
+            "MAPPING_NOT_FOUND",
+            f"Proxy {proxy_id} is not assigned to domain {domain_id}"
         )
+    mapping_id, existing_proxies = mapping_row
+
+    await db.execute(delete(DomainProxy).where(DomainProxy.id == mapping_id))
+    await db.commit()
 
-    db.delete(domain_proxy)
-    db.commit()
+    await invalidate(f"domain:{domain_id}:*", "domains:list:*")
 
-    # Get remaining proxies count
-    remaining_proxies = db.query(func.count(DomainProxy.id))\
-        .filter(DomainProxy.domain_id == domain_id)\
-        .scalar() or 0
+    remaining_proxies = existing_proxies - 1
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "domain_id": domain_id,
             "proxy_id": proxy_id,
             "remaining_proxies": remaining_proxies
         },
-        message="Proxy removed from domain successfully"
-    )
+        "message": "Proxy removed from domain successfully"
+    })
 
 
-@router.post("/{proxy_id}/enable", response_model=ApiResponse[dict])
+@router.post("/{proxy_id}/enable", response_model=DictApiResponse)
 async def enable_domain_proxy_mapping(
     domain_id: int,
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Enable specific proxy for specific domain and reset failure count.
@@ -264,48 +265,47 @@ async def enable_domain_proxy_mapping(
     - 200: Mapping enabled successfully
     - 404: Mapping not found
     """
-    domain_proxy = db.query(DomainProxy).filter(
-        and_(
-            DomainProxy.domain_id == domain_id,
-            DomainProxy.proxy_id == proxy_id
+    # Update in SQL without loading the mapping row
+    mapping_id = await db.scalar(
+        update(DomainProxy)
+        .where(
+            and_(
+                DomainProxy.domain_id == domain_id,
+                DomainProxy.proxy_id == proxy_id
+            )
         )
-    ).first()
+        .values(is_active=True, failure_count=0)
+        .returning(DomainProxy.id)
+    )
 
-    if not domain_proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "MAPPING_NOT_FOUND",
-                    "message": f"Proxy {proxy_id} is not assigned to domain {domain_id}"
-                }
-            }
+    if mapping_id is None:
+        raise ApiError(
+            404,
+            "MAPPING_NOT_FOUND",
+            f"Proxy {proxy_id} is not assigned to domain {domain_id}"
         )
 
-    domain_proxy.is_active = True
-    domain_proxy.failure_count = 0
-    domain_proxy.updated_at = datetime.utcnow()
+    await db.commit()
 
-    db.commit()
+    await invalidate(f"domain:{domain_id}:*", "domains:list:*")
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "domain_id": domain_id,
             "proxy_id": proxy_id,
             "is_active": True,
             "failure_count": 0
         },
-        message="Domain-proxy mapping enabled successfully"
-    )
+        "message": "Domain-proxy mapping enabled successfully"
+    })
 
 
-@router.post("/{proxy_id}/disable", response_model=ApiResponse[dict])
+@router.post("/{proxy_id}/disable", response_model=DictApiResponse)
 async def disable_domain_proxy_mapping(
     domain_id: int,
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Disable specific proxy for specific domain (keeps mapping, just disables).
@@ -314,45 +314,46 @@ async def disable_domain_proxy_mapping(
     - 200: Mapping disabled successfully
     - 404: Mapping not found
     """
-    domain_proxy = db.query(DomainProxy).filter(
-        and_(
-            DomainProxy.domain_id == domain_id,
-            DomainProxy.proxy_id == proxy_id
+    # Update in SQL without loading the mapping row
+    mapping_id = await db.scalar(
+        update(DomainProxy)
+        .where(
+            and_(
+                DomainProxy.domain_id == domain_id,
+                DomainProxy.proxy_id == proxy_id
+            )
         )
-    ).first()
+        .values(is_active=False)
+        .returning(DomainProxy.id)
+    )
 
-    if not domain_proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "MAPPING_NOT_FOUND",
-                    "message": f"Proxy {proxy_id} is not assigned to domain {domain_id}"
-                }
-            }
+    if mapping_id is None:
+        raise ApiError(
+            404,
+            "MAPPING_NOT_FOUND",
+            f"Proxy {proxy_id} is not assigned to domain {domain_id}"
         )
 
-    domain_proxy.is_active = False
-    domain_proxy.updated_at = datetime.utcnow()
+    await db.commit()
 
-    db.commit()
+    await invalidate(f"domain:{domain_id}:*", "domains:list:*")
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "domain_id": domain_id,
             "proxy_id": proxy_id,
             "is_active": False
         },
-        message="Domain-proxy mapping disabled successfully"
-    )
+        "message": "Domain-proxy mapping disabled successfully"
+    })
 
 
-@router.get("/stats", response_model=ApiResponse[DomainProxyStatsResponse])
+@router.get("/stats", response_model=DomainProxyStatsApiResponse)
+@cache_swr(key_fn=lambda **kw: f"domain:{kw['domain_id']}:stats", ttl=300, stale_ttl=60)
 async def get_domain_proxy_stats(
     domain_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get aggregate statistics for domain's proxy usage.
@@ -362,63 +363,64 @@ async def get_domain_proxy_stats(
     - 404: Domain not found
     """
     # Verify domain exists
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
-    if not domain:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_NOT_FOUND",
-                    "message": f"Domain with ID {domain_id} not found"
-                }
-            }
+    domain_name = await db.scalar(
+        select(Domain.domain_name).where(Domain.id == domain_id)
+    )
+    if domain_name is None:
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {domain_id} not found")
+
+    # Calculate stats and the per-country distribution in one pass: ROLLUP
+    # yields a row per country plus a grand-total row (grouping() == 1)
+    rows = (
+        await db.execute(
+            select(
+                Proxy.country_code,
+                func.grouping(Proxy.country_code),
+                func.count(DomainProxy.id),
+                func.count(DomainProxy.id).filter(DomainProxy.is_active == True),
+                func.count(DomainProxy.id).filter(DomainProxy.failure_count > 5),
+                func.coalesce(func.sum(DomainProxy.success_count), 0),
+                func.coalesce(func.sum(DomainProxy.failure_count), 0),
+                func.avg(func.nullif(DomainProxy.avg_response_time_ms, 0))
+            )
+            .join(Proxy, DomainProxy.proxy_id == Proxy.id)
+            .where(DomainProxy.domain_id == domain_id)
+            .group_by(func.rollup(Proxy.country_code))
         )
+    ).all()
 
-    # Get all domain proxies with proxy info
-    domain_proxies = db.query(DomainProxy)\
-        .options(joinedload(DomainProxy.proxy))\
-        .filter(DomainProxy.domain_id == domain_id)\
-        .all()
-
-    # Calculate stats
-    total_proxies = len(domain_proxies)
-    active_proxies = sum(1 for dp in domain_proxies if dp.is_active)
-    failing_proxies = sum(1 for dp in domain_proxies if dp.failure_count > 5)
+    proxy_distribution = {}
+    for country_code, is_total, *aggregates in rows:
+        if is_total:
+            (
+                total_proxies,
+                active_proxies,
+                failing_proxies,
+                total_success,
+                total_failures,
+                avg_response_time_ms
+            ) = aggregates
+        elif country_code:
+            proxy_distribution[country_code] = aggregates[0]
 
-    total_success = sum(dp.success_count for dp in domain_proxies)
-    total_failures = sum(dp.failure_count for dp in domain_proxies)
     total_requests = total_success + total_failures
-
     overall_success_rate = calculate_success_rate_percent(total_success, total_failures)
+    if avg_response_time_ms is not None:
+        avg_response_time_ms = int(avg_response_time_ms)
 
-    # Calculate average response time
-    response_times = [dp.avg_response_time_ms for dp in domain_proxies if dp.avg_response_time_ms]
-    avg_response_time_ms = int(sum(response_times) / len(response_times)) if response_times else None
-
-    # Proxy distribution by country
-    proxy_distribution = {}
-    for dp in domain_proxies:
-        if dp.proxy and dp.proxy.country_code:
-            country = dp.proxy.country_code
-            proxy_distribution[country] = proxy_distribution.get(country, 0) + 1
-
-    # Build response
-    stats = DomainProxyStatsResponse(
-        domain_id=domain_id,
-        domain_name=domain.domain_name,
-        total_proxies=total_proxies,
-        active_proxies=active_proxies,
-        failing_proxies=failing_proxies,
-        overall_success_rate=overall_success_rate,
-        avg_response_time_ms=avg_response_time_ms,
-        total_requests=total_requests,
-        total_success=total_success,
-        total_failures=total_failures,
-        proxy_distribution=proxy_distribution
-    )
-
-    return ApiResponse(
-        success=True,
-        data=stats
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": {
+            "domain_id": domain_id,
+            "domain_name": domain_name,
+            "total_proxies": total_proxies,
+            "active_proxies": active_proxies,
+            "failing_proxies": failing_proxies,
+            "overall_success_rate": overall_success_rate,
+            "avg_response_time_ms": avg_response_time_ms,
+            "total_requests": total_requests,
+            "total_success": total_success,
+            "total_failures": total_failures,
+            "proxy_distribution": proxy_distribution
+        }
+    })
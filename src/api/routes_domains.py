@@ -4,30 +4,51 @@ Domain Management API Routes.
 Endpoints for managing crawl domains and their configurations.
 """
 
-from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_async_db
 from src.core.models import Domain, CrawlTask, DomainProxy
 from src.api.schemas.domain import (
     DomainCreate,
     DomainUpdate,
-    DomainResponse,
-    DomainDetailResponse
+    DomainApiResponse,
+    DomainListResponse
 )
-from src.api.schemas.response import ApiResponse, PaginatedResponse, PaginationInfo
+from src.api.errors import ApiError
+from src.api.responses import ORJSONResponse, pagination_info
+from src.services.cache_service import cache_swr, invalidate
 
 
 router = APIRouter()
 
 
-@router.post("", response_model=ApiResponse[DomainDetailResponse], status_code=201)
+def _domain_detail(domain: Domain) -> dict:
+    """Build detailed domain payload from ORM instance."""
+    return {
+        "id": domain.id,
+        "domain_name": domain.domain_name,
+        "base_url": domain.base_url,
+        "parser_name": domain.parser_name,
+        "crawl_delay_seconds": domain.crawl_delay_seconds,
+        "max_concurrent_requests": domain.max_concurrent_requests,
+        "default_crawl_frequency": str(domain.default_crawl_frequency),
+        "is_active": domain.is_active,
+        "robots_txt_url": domain.robots_txt_url,
+        "robots_txt_content": domain.robots_txt_content,
+        "robots_txt_last_fetched": domain.robots_txt_last_fetched,
+        "user_agent": domain.user_agent,
+        "created_at": domain.created_at,
+        "updated_at": domain.updated_at
+    }
+
+
+@router.post("", response_model=DomainApiResponse, status_code=201)
 async def create_domain(
     domain_data: DomainCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new domain for crawling.
@@ -39,68 +60,51 @@ async def create_domain(
     - 409: Domain name already exists
     """
     # Check for duplicate domain name
-    existing_domain = db.query(Domain).filter(Domain.domain_name == domain_data.domain_name).first()
-    if existing_domain:
-        raise HTTPException(
-            status_code=409,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DUPLICATE_DOMAIN",
-                    "message": f"Domain '{domain_data.domain_name}' already exists",
-                    "details": {"existing_domain_id": existing_domain.id}
-                }
-            }
+    existing_domain_id = await db.scalar(
+        select(Domain.id).where(Domain.domain_name == domain_data.domain_name)
+    )
+    if existing_domain_id is not None:
+        raise ApiError(
+            409,
+            "DUPLICATE_DOMAIN",
+            f"Domain '{domain_data.domain_name}' already exists",
+            details={"existing_domain_id": existing_domain_id}
         )
 
     # Create new domain
     new_domain = Domain(
         domain_name=domain_data.domain_name,
-        base_url=str(domain_data.base_url),
+        base_url=domain_data.base_url,
         parser_name=domain_data.parser_name,
         crawl_delay_seconds=domain_data.crawl_delay_seconds,
         max_concurrent_requests=domain_data.max_concurrent_requests,
         default_crawl_frequency=domain_data.default_crawl_frequency,
         is_active=True,
         user_agent=domain_data.user_agent,
-        robots_txt_url=domain_data.robots_txt_url,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        robots_txt_url=domain_data.robots_txt_url
     )
 
     db.add(new_domain)
-    db.commit()
-    db.refresh(new_domain)
-
-    # Build response
-    response_data = DomainDetailResponse(
-        id=new_domain.id,
-        domain_name=new_domain.domain_name,
-        base_url=new_domain.base_url,
-        parser_name=new_domain.parser_name,
-        crawl_delay_seconds=new_domain.crawl_delay_seconds,
-        max_concurrent_requests=new_domain.max_concurrent_requests,
-        default_crawl_frequency=str(new_domain.default_crawl_frequency),
-        is_active=new_domain.is_active,
-        robots_txt_url=new_domain.robots_txt_url,
-        robots_txt_content=new_domain.robots_txt_content,
-        robots_txt_last_fetched=new_domain.robots_txt_last_fetched,
-        user_agent=new_domain.user_agent,
-        created_at=new_domain.created_at,
-        updated_at=new_domain.updated_at
-    )
-
-    return ApiResponse(
-        success=True,
-        data=response_data,
-        message="Domain created successfully"
+    await db.commit()
+    await db.refresh(new_domain)
+
+    await invalidate("domains:list:*")
+
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": _domain_detail(new_domain),
+            "message": "Domain created successfully"
+        },
+        status_code=201
     )
 
 
-@router.get("/{domain_id}", response_model=ApiResponse[DomainDetailResponse])
+@router.get("/{domain_id}", response_model=DomainApiResponse)
+@cache_swr(key_fn=lambda **kw: f"domain:{kw['domain_id']}:detail", ttl=300, stale_ttl=60)
 async def get_domain_details(
     domain_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a specific domain.
@@ -109,111 +113,119 @@ async def get_domain_details(
     - 200: Domain details retrieved successfully
     - 404: Domain not found
     """
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
+    domain = await db.get(Domain, domain_id)
 
     if not domain:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_NOT_FOUND",
-                    "message": f"Domain with ID {domain_id} not found"
-                }
-            }
-        )
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {domain_id} not found")
 
-    # Build detailed response
-    response_data = DomainDetailResponse(
-        id=domain.id,
-        domain_name=domain.domain_name,
-        base_url=domain.base_url,
-        parser_name=domain.parser_name,
-        crawl_delay_seconds=domain.crawl_delay_seconds,
-        max_concurrent_requests=domain.max_concurrent_requests,
-        default_crawl_frequency=str(domain.default_crawl_frequency),
-        is_active=domain.is_active,
-        robots_txt_url=domain.robots_txt_url,
-        robots_txt_content=domain.robots_txt_content,
-        robots_txt_last_fetched=domain.robots_txt_last_fetched,
-        user_agent=domain.user_agent,
-        created_at=domain.created_at,
-        updated_at=domain.updated_at
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": _domain_detail(domain)
+    })
 
-    return ApiResponse(
-        success=True,
-        data=response_data
-    )
 
-
-@router.get("", response_model=PaginatedResponse[DomainResponse])
+@router.get("", response_model=DomainListResponse)
+@cache_swr(
+    key_fn=lambda **kw: f"domains:list:{kw['is_active']}:{kw['page']}:{kw['per_page']}",
+    ttl=30,
+    stale_ttl=30
+)
 async def list_domains(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Results per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all domains with optional filtering and pagination.
 
+    Cached briefly; task counts are not invalidated on task creation, so
+    total_tasks may lag by up to a minute.
+
     **Returns:**
     - 200: Domains list with pagination metadata
     """
-    # Build query with filters
-    query = db.query(Domain)
-
+    # Build filters
+    filters = []
     if is_active is not None:
-        query = query.filter(Domain.is_active == is_active)
-
-    # Get total count
-    total_count = query.count()
+        filters.append(Domain.is_active == is_active)
 
-    # Apply pagination
+    # Page of domains with the filtered total as a window count
     offset = (page - 1) * per_page
-    domains = query.offset(offset).limit(per_page).all()
+    domain_page = (
+        select(
+            Domain.id,
+            Domain.domain_name,
+            Domain.parser_name,
+            Domain.is_active,
+            Domain.created_at,
+            func.count().over().label("total_count")
+        )
+        .where(*filters)
+        .order_by(Domain.id)
+        .offset(offset)
+        .limit(per_page)
+        .subquery()
+    )
 
-    # Build response list with stats
-    domain_responses = []
-    for domain in domains:
-        # Count total tasks for this domain
-        total_tasks = db.query(func.count(CrawlTask.id))\
-            .filter(CrawlTask.domain_id == domain.id)\
-            .scalar() or 0
-
-        # Count active proxies for this domain
-        active_proxies = db.query(func.count(DomainProxy.id))\
-            .filter(
-                and_(
-                    DomainProxy.domain_id == domain.id,
-                    DomainProxy.is_active == True
-                )
-            ).scalar() or 0
-
-        domain_responses.append(
-            DomainResponse(
-                id=domain.id,
-                domain_name=domain.domain_name,
-                parser_name=domain.parser_name,
-                is_active=domain.is_active,
-                total_tasks=total_tasks,
-                active_proxies=active_proxies,
-                created_at=domain.created_at
+    # Per-domain stats, correlated against the page rows only
+    total_tasks = (
+        select(func.count(CrawlTask.id))
+        .where(CrawlTask.domain_id == domain_page.c.id)
+        .scalar_subquery()
+    )
+    active_proxies = (
+        select(func.count(DomainProxy.id))
+        .where(
+            and_(
+                DomainProxy.domain_id == domain_page.c.id,
+                DomainProxy.is_active == True
             )
         )
-
-    # Calculate pagination info
-    total_pages = (total_count + per_page - 1) // per_page
-
-    pagination = PaginationInfo(
-        page=page,
-        per_page=per_page,
-        total=total_count,
-        total_pages=total_pages
+        .scalar_subquery()
     )
 
-    return PaginatedResponse(
-        success=True,
-        data=domain_responses,
-        pagination=pagination
-    )
+    rows = (
+        await db.execute(
+            select(
+                domain_page.c.id,
+                domain_page.c.domain_name,
+                domain_page.c.parser_name,
+                domain_page.c.is_active,
+                total_tasks.label("total_tasks"),
+                active_proxies.label("active_proxies"),
+                domain_page.c.created_at,
+                domain_page.c.total_count
+            ).order_by(domain_page.c.id)
+        )
+    ).all()
+
+    if rows:
+        total_count = rows[0].total_count
+    elif page > 1:
+        # Past the last page: no rows to carry the window count
+        total_count = await db.scalar(
+            select(func.count(Domain.id)).where(*filters)
+        )
+    else:
+        total_count = 0
+
+    # Build response list with stats
+    domain_responses = [
+        {
+            "id": row.id,
+            "domain_name": row.domain_name,
+            "parser_name": row.parser_name,
+            "is_active": row.is_active,
+            "total_tasks": row.total_tasks,
+            "active_proxies": row.active_proxies,
+            "created_at": row.created_at
+        }
+        for row in rows
+    ]
+
+    return ORJSONResponse({
+        "success": True,
+        "data": domain_responses,
+        "pagination": pagination_info(page, per_page, total_count)
+    })
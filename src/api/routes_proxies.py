@@ -4,38 +4,82 @@ Proxy Management API Routes.
 Endpoints for managing proxy pool and health monitoring.
 """
 
-from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, delete, func, insert, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
-from src.core.database import get_db
-from src.core.models import Proxy, DomainProxy
+from src.core.database import get_async_db
+from src.core.models import Proxy
 from src.api.schemas.proxy import (
     ProxyCreate,
     ProxyUpdate,
-    ProxyResponse,
-    ProxyDetailResponse
+    ProxyApiResponse,
+    ProxyListResponse
 )
-from src.api.schemas.response import ApiResponse, PaginatedResponse, PaginationInfo
+from src.api.schemas.response import DictApiResponse, EmptyApiResponse
+from src.api.errors import ApiError
+from src.api.responses import ORJSONResponse, pagination_info
+from src.services.cache_service import cache_swr, invalidate
 
 
 router = APIRouter()
 
 
-def calculate_success_rate(success_count: int, failure_count: int) -> float:
-    """Calculate success rate percentage."""
-    total = success_count + failure_count
-    if total == 0:
-        return 0.0
-    return round((success_count / total) * 100, 2)
+# Columns rendered by ProxyDetailResponse
+PROXY_DETAIL_COLUMNS = (
+    Proxy.id,
+    Proxy.proxy_url,
+    Proxy.proxy_port,
+    Proxy.proxy_protocol,
+    Proxy.proxy_username,
+    Proxy.country_code,
+    Proxy.city,
+    Proxy.provider,
+    Proxy.is_active,
+    Proxy.failure_count,
+    Proxy.success_count,
+    Proxy.last_used_at,
+    Proxy.last_success_at,
+    Proxy.last_failure_at,
+    Proxy.avg_response_time_ms,
+    Proxy.monthly_cost,
+    Proxy.max_requests_per_hour,
+    Proxy.created_at,
+    Proxy.updated_at
+)
 
 
-@router.post("", response_model=ApiResponse[ProxyDetailResponse], status_code=201)
+def _proxy_detail(proxy) -> dict:
+    """Build detailed proxy payload from an ORM instance or PROXY_DETAIL_COLUMNS row."""
+    return {
+        "id": proxy.id,
+        "proxy_url": proxy.proxy_url,
+        "proxy_port": proxy.proxy_port,
+        "proxy_protocol": proxy.proxy_protocol,
+        "proxy_username": proxy.proxy_username,
+        "country_code": proxy.country_code,
+        "city": proxy.city,
+        "provider": proxy.provider,
+        "is_active": proxy.is_active,
+        "failure_count": proxy.failure_count,
+        "success_count": proxy.success_count,
+        "last_used_at": proxy.last_used_at,
+        "last_success_at": proxy.last_success_at,
+        "last_failure_at": proxy.last_failure_at,
+        "avg_response_time_ms": proxy.avg_response_time_ms,
+        "monthly_cost": proxy.monthly_cost,
+        "max_requests_per_hour": proxy.max_requests_per_hour,
+        "created_at": proxy.created_at,
+        "updated_at": proxy.updated_at
+    }
+
+
+@router.post("", response_model=ProxyApiResponse, status_code=201)
 async def create_proxy(
     proxy_data: ProxyCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a new proxy to the pool.
@@ -45,142 +89,88 @@ async def create_proxy(
     - 409: Proxy already exists
     """
     # Check for duplicate proxy
-    existing_proxy = db.query(Proxy).filter(
-        and_(
-            Proxy.proxy_url == proxy_data.proxy_url,
-            Proxy.proxy_port == proxy_data.proxy_port
-        )
-    ).first()
-
-    if existing_proxy:
-        raise HTTPException(
-            status_code=409,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DUPLICATE_PROXY",
-                    "message": f"Proxy {proxy_data.proxy_url}:{proxy_data.proxy_port} already exists",
-                    "details": {"existing_proxy_id": existing_proxy.id}
-                }
-            }
+    existing_proxy_id = await db.scalar(
+        select(Proxy.id).where(
+            and_(
+                Proxy.proxy_url == proxy_data.proxy_url,
+                Proxy.proxy_port == proxy_data.proxy_port
+            )
         )
-
-    # Create new proxy
-    new_proxy = Proxy(
-        proxy_url=proxy_data.proxy_url,
-        proxy_port=proxy_data.proxy_port,
-        proxy_protocol=proxy_data.proxy_protocol,
-        proxy_username=proxy_data.proxy_username,
-        proxy_password=proxy_data.proxy_password,
-        country_code=proxy_data.country_code,
-        city=proxy_data.city,
-        provider=proxy_data.provider,
-        is_active=True,
-        failure_count=0,
-        success_count=0,
-        monthly_cost=proxy_data.monthly_cost,
-        max_requests_per_hour=proxy_data.max_requests_per_hour,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
     )
 
-    db.add(new_proxy)
-    db.commit()
-    db.refresh(new_proxy)
-
-    # Build response
-    response_data = ProxyDetailResponse(
-        id=new_proxy.id,
-        proxy_url=new_proxy.proxy_url,
-        proxy_port=new_proxy.proxy_port,
-        proxy_protocol=new_proxy.proxy_protocol,
-        proxy_username=new_proxy.proxy_username,
-        country_code=new_proxy.country_code,
-        city=new_proxy.city,
-        provider=new_proxy.provider,
-        is_active=new_proxy.is_active,
-        failure_count=new_proxy.failure_count,
-        success_count=new_proxy.success_count,
-        last_used_at=new_proxy.last_used_at,
-        last_success_at=new_proxy.last_success_at,
-        last_failure_at=new_proxy.last_failure_at,
-        avg_response_time_ms=new_proxy.avg_response_time_ms,
-        monthly_cost=new_proxy.monthly_cost,
-        max_requests_per_hour=new_proxy.max_requests_per_hour,
-        created_at=new_proxy.created_at,
-        updated_at=new_proxy.updated_at
-    )
+    if existing_proxy_id is not None:
+        raise ApiError(
+            409,
+            "DUPLICATE_PROXY",
+            f"Proxy {proxy_data.proxy_url}:{proxy_data.proxy_port} already exists",
+            details={"existing_proxy_id": existing_proxy_id}
+        )
 
-    return ApiResponse(
-        success=True,
-        data=response_data,
-        message="Proxy created successfully"
+    # Create the proxy and read back the response columns in one statement
+    # (a refresh would skip the deferred "cold" columns)
+    new_proxy = (
+        await db.execute(
+            insert(Proxy).values(
+                # Unset fields are omitted so column defaults apply
+                **proxy_data.model_dump(exclude_none=True),
+                is_active=True,
+                failure_count=0,
+                success_count=0
+            ).returning(*PROXY_DETAIL_COLUMNS)
+        )
+    ).one()
+    await db.commit()
+
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": _proxy_detail(new_proxy),
+            "message": "Proxy created successfully"
+        },
+        status_code=201
     )
 
 
-@router.get("/{proxy_id}", response_model=ApiResponse[ProxyDetailResponse])
+@router.get("/{proxy_id}", response_model=ProxyApiResponse)
+@cache_swr(key_fn=lambda **kw: f"proxy:{kw['proxy_id']}:detail", ttl=60, stale_ttl=30)
 async def get_proxy_details(
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a specific proxy.
 
+    Cached and invalidated by the proxy update/enable/disable/delete
+    endpoints. Also served for HEAD.
+
     **Returns:**
     - 200: Proxy details retrieved successfully
     - 404: Proxy not found
     """
-    proxy = db.query(Proxy).filter(Proxy.id == proxy_id).first()
+    proxy = await db.get(Proxy, proxy_id, options=[undefer_group("cold")])
 
     if not proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxy with ID {proxy_id} not found"
-                }
-            }
-        )
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxy with ID {proxy_id} not found")
 
-    # Build detailed response
-    response_data = ProxyDetailResponse(
-        id=proxy.id,
-        proxy_url=proxy.proxy_url,
-        proxy_port=proxy.proxy_port,
-        proxy_protocol=proxy.proxy_protocol,
-        proxy_username=proxy.proxy_username,
-        country_code=proxy.country_code,
-        city=proxy.city,
-        provider=proxy.provider,
-        is_active=proxy.is_active,
-        failure_count=proxy.failure_count,
-        success_count=proxy.success_count,
-        last_used_at=proxy.last_used_at,
-        last_success_at=proxy.last_success_at,
-        last_failure_at=proxy.last_failure_at,
-        avg_response_time_ms=proxy.avg_response_time_ms,
-        monthly_cost=proxy.monthly_cost,
-        max_requests_per_hour=proxy.max_requests_per_hour,
-        created_at=proxy.created_at,
-        updated_at=proxy.updated_at
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": _proxy_detail(proxy)
+    })
 
-    return ApiResponse(
-        success=True,
-        data=response_data
-    )
+
+router.add_api_route(
+    "/{proxy_id}", get_proxy_details, methods=["HEAD"], include_in_schema=False
+)
 
 
-@router.get("", response_model=PaginatedResponse[ProxyResponse])
+@router.get("", response_model=ProxyListResponse)
 async def list_proxies(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     country_code: Optional[str] = Query(None, min_length=2, max_length=2, description="Filter by country"),
     provider: Optional[str] = Query(None, description="Filter by provider"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Results per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all proxies with filtering and pagination.
@@ -188,9 +178,7 @@ async def list_proxies(
     **Returns:**
     - 200: Proxies list with pagination metadata
     """
-    # Build query with filters
-    query = db.query(Proxy)
-
+    # Build filters
     filters = []
     if is_active is not None:
         filters.append(Proxy.is_active == is_active)
@@ -199,56 +187,70 @@ async def list_proxies(
     if provider is not None:
         filters.append(Proxy.provider == provider)
 
-    if filters:
-        query = query.filter(and_(*filters))
-
-    # Get total count
-    total_count = query.count()
+    # Page of proxy columns with the filtered total as a window count.
+    # The lambda_stmt base is built once; filters are appended per request
+    # and cached per query shape.
+    query = lambda_stmt(lambda: select(
+        Proxy.id,
+        Proxy.proxy_url,
+        Proxy.proxy_port,
+        Proxy.proxy_protocol,
+        Proxy.country_code,
+        Proxy.is_active,
+        Proxy.success_count,
+        Proxy.failure_count,
+        Proxy.success_rate_percent,
+        Proxy.avg_response_time_ms,
+        Proxy.last_used_at,
+        func.count().over().label("total_count")
+    ))
+    for criterion in filters:
+        query += lambda s: s.where(criterion)
 
-    # Apply pagination
     offset = (page - 1) * per_page
-    proxies = query.offset(offset).limit(per_page).all()
+    query += lambda s: s.order_by(Proxy.id).offset(offset).limit(per_page)
+    rows = (await db.execute(query)).all()
+
+    if rows:
+        total_count = rows[0].total_count
+    elif page > 1:
+        # Past the last page: no rows to carry the window count
+        total_count = await db.scalar(
+            select(func.count(Proxy.id)).where(*filters)
+        )
+    else:
+        total_count = 0
 
-    # Build response list
+    # Build response list from plain rows (no ORM instances)
     proxy_responses = [
-        ProxyResponse(
-            id=proxy.id,
-            proxy_url=proxy.proxy_url,
-            proxy_port=proxy.proxy_port,
-            proxy_protocol=proxy.proxy_protocol,
-            country_code=proxy.country_code,
-            is_active=proxy.is_active,
-            success_count=proxy.success_count,
-            failure_count=proxy.failure_count,
-            success_rate=calculate_success_rate(proxy.success_count, proxy.failure_count),
-            avg_response_time_ms=proxy.avg_response_time_ms,
-            last_used_at=proxy.last_used_at
-        )
-        for proxy in proxies
+        {
+            "id": row.id,
+            "proxy_url": row.proxy_url,
+            "proxy_port": row.proxy_port,
+            "proxy_protocol": row.proxy_protocol,
+            "country_code": row.country_code,
+            "is_active": row.is_active,
+            "success_count": row.success_count,
+            "failure_count": row.failure_count,
+            "success_rate": row.success_rate_percent,
+            "avg_response_time_ms": row.avg_response_time_ms,
+            "last_used_at": row.last_used_at
+        }
+        for row in rows
     ]
 
-    # Calculate pagination info
-    total_pages = (total_count + per_page - 1) // per_page
-
-    pagination = PaginationInfo(
-        page=page,
-        per_page=per_page,
-        total=total_count,
-        total_pages=total_pages
-    )
-
-    return PaginatedResponse(
-        success=True,
-        data=proxy_responses,
-        pagination=pagination
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": proxy_responses,
+        "pagination": pagination_info(page, per_page, total_count)
+    })
 
 
-@router.patch("/{proxy_id}", response_model=ApiResponse[ProxyDetailResponse])
+@router.patch("/{proxy_id}", response_model=ProxyApiResponse)
 async def update_proxy(
     proxy_id: int,
     update_data: ProxyUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update proxy settings.
@@ -257,71 +259,39 @@ async def update_proxy(
     - 200: Proxy updated successfully
     - 404: Proxy not found
     """
-    proxy = db.query(Proxy).filter(Proxy.id == proxy_id).first()
-
-    if not proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxy with ID {proxy_id} not found"
-                }
-            }
+    # Only fields that were provided are updated
+    values = update_data.model_dump(exclude_none=True)
+
+    # Update and read back the response columns in one statement
+    if values:
+        statement = (
+            update(Proxy)
+            .where(Proxy.id == proxy_id)
+            .values(**values)
+            .returning(*PROXY_DETAIL_COLUMNS)
         )
+    else:
+        statement = select(*PROXY_DETAIL_COLUMNS).where(Proxy.id == proxy_id)
+    proxy = (await db.execute(statement)).first()
 
-    # Update fields
-    if update_data.is_active is not None:
-        proxy.is_active = update_data.is_active
-    if update_data.monthly_cost is not None:
-        proxy.monthly_cost = update_data.monthly_cost
-    if update_data.max_requests_per_hour is not None:
-        proxy.max_requests_per_hour = update_data.max_requests_per_hour
-    if update_data.proxy_username is not None:
-        proxy.proxy_username = update_data.proxy_username
-    if update_data.proxy_password is not None:
-        proxy.proxy_password = update_data.proxy_password
-
-    proxy.updated_at = datetime.utcnow()
-
-    db.commit()
-    db.refresh(proxy)
-
-    # Build response
-    response_data = ProxyDetailResponse(
-        id=proxy.id,
-        proxy_url=proxy.proxy_url,
-        proxy_port=proxy.proxy_port,
-        proxy_protocol=proxy.proxy_protocol,
-        proxy_username=proxy.proxy_username,
-        country_code=proxy.country_code,
-        city=proxy.city,
-        provider=proxy.provider,
-        is_active=proxy.is_active,
-        failure_count=proxy.failure_count,
-        success_count=proxy.success_count,
-        last_used_at=proxy.last_used_at,
-        last_success_at=proxy.last_success_at,
-        last_failure_at=proxy.last_failure_at,
-        avg_response_time_ms=proxy.avg_response_time_ms,
-        monthly_cost=proxy.monthly_cost,
-        max_requests_per_hour=proxy.max_requests_per_hour,
-        created_at=proxy.created_at,
-        updated_at=proxy.updated_at
-    )
+    if proxy is None:
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxy with ID {proxy_id} not found")
 
-    return ApiResponse(
-        success=True,
-        data=response_data,
-        message="Proxy updated successfully"
-    )
+    await db.commit()
+
+    await invalidate(f"proxy:{proxy_id}:detail")
 
+    return ORJSONResponse({
+        "success": True,
+        "data": _proxy_detail(proxy),
+        "message": "Proxy updated successfully"
+    })
 
-@router.post("/{proxy_id}/enable", response_model=ApiResponse[dict])
+
+@router.post("/{proxy_id}/enable", response_model=DictApiResponse)
 async def enable_proxy(
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Enable proxy and reset failure count.
@@ -330,41 +300,38 @@ async def enable_proxy(
     - 200: Proxy enabled successfully
     - 404: Proxy not found
     """
-    proxy = db.query(Proxy).filter(Proxy.id == proxy_id).first()
-
-    if not proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxy with ID {proxy_id} not found"
-                }
-            }
+    # Update in SQL without loading the proxy row
+    proxy = (
+        await db.execute(
+            update(Proxy)
+            .where(Proxy.id == proxy_id)
+            .values(is_active=True, failure_count=0)
+            .returning(Proxy.id, Proxy.is_active, Proxy.failure_count)
         )
+    ).first()
+
+    if proxy is None:
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxy with ID {proxy_id} not found")
 
-    proxy.is_active = True
-    proxy.failure_count = 0
-    proxy.updated_at = datetime.utcnow()
+    await db.commit()
 
-    db.commit()
+    await invalidate(f"proxy:{proxy_id}:detail")
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "proxy_id": proxy.id,
             "is_active": proxy.is_active,
             "failure_count": proxy.failure_count
         },
-        message="Proxy enabled successfully"
-    )
+        "message": "Proxy enabled successfully"
+    })
 
 
-@router.post("/{proxy_id}/disable", response_model=ApiResponse[dict])
+@router.post("/{proxy_id}/disable", response_model=DictApiResponse)
 async def disable_proxy(
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Disable proxy (stops using it for crawling).
@@ -373,39 +340,37 @@ async def disable_proxy(
     - 200: Proxy disabled successfully
     - 404: Proxy not found
     """
-    proxy = db.query(Proxy).filter(Proxy.id == proxy_id).first()
-
-    if not proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxy with ID {proxy_id} not found"
-                }
-            }
+    # Update in SQL without loading the proxy row
+    proxy = (
+        await db.execute(
+            update(Proxy)
+            .where(Proxy.id == proxy_id)
+            .values(is_active=False)
+            .returning(Proxy.id, Proxy.is_active)
         )
+    ).first()
+
+    if proxy is None:
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxy with ID {proxy_id} not found")
 
-    proxy.is_active = False
-    proxy.updated_at = datetime.utcnow()
+    await db.commit()
 
-    db.commit()
+    await invalidate(f"proxy:{proxy_id}:detail")
 
-    return ApiResponse(
-        success=True,
-        data={
+    return ORJSONResponse({
+        "success": True,
+        "data": {
             "proxy_id": proxy.id,
             "is_active": proxy.is_active
         },
-        message="Proxy disabled successfully"
-    )
+        "message": "Proxy disabled successfully"
+    })
 
 
-@router.delete("/{proxy_id}", response_model=ApiResponse[None])
+@router.delete("/{proxy_id}", response_model=EmptyApiResponse)
 async def delete_proxy(
     proxy_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove proxy from pool (cascade deletes domain_proxies mappings).
@@ -414,25 +379,21 @@ async def delete_proxy(
     - 200: Proxy deleted successfully
     - 404: Proxy not found
     """
-    proxy = db.query(Proxy).filter(Proxy.id == proxy_id).first()
+    # Delete in SQL; the foreign keys cascade mappings and null task proxy_id
+    deleted_id = await db.scalar(
+        delete(Proxy).where(Proxy.id == proxy_id).returning(Proxy.id)
+    )
 
-    if not proxy:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "PROXY_NOT_FOUND",
-                    "message": f"Proxy with ID {proxy_id} not found"
-                }
-            }
-        )
+    if deleted_id is None:
+        raise ApiError(404, "PROXY_NOT_FOUND", f"Proxy with ID {proxy_id} not found")
 
-    db.delete(proxy)
-    db.commit()
+    await db.commit()
 
-    return ApiResponse(
-        success=True,
-        data=None,
-        message="Proxy deleted successfully"
-    )
+    # Deleting a proxy cascades to its domain mappings
+    await invalidate(f"proxy:{proxy_id}:detail", "domain:*:stats", "domains:list:*")
+
+    return ORJSONResponse({
+        "success": True,
+        "data": None,
+        "message": "Proxy deleted successfully"
+    })
@@ -4,42 +4,122 @@ Crawl Task Management API Routes.
 Endpoints for submitting, monitoring, and managing crawl tasks.
 """
 
-import hashlib
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, asc
-
-from src.core.database import get_db
-from src.core.models import CrawlTask, Domain, Proxy
+from typing import Optional, Literal
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from src.core.database import get_async_db, utc_now
+from src.core.models import CrawlTask, CrawlTaskStatus, Domain, Proxy
 from src.api.schemas.crawl_job import (
     CrawlTaskCreate,
-    CrawlTaskResponse,
-    CrawlTaskDetailResponse,
-    CrawlTaskFilter
+    CrawlTaskBulkCreate,
+    CrawlTaskApiResponse,
+    CrawlTaskDetailApiResponse,
+    CrawlTaskListResponse
 )
-from src.api.schemas.response import ApiResponse, PaginatedResponse, PaginationInfo
+from src.api.schemas.response import DictApiResponse
+from src.api.errors import ApiError
+from src.api.responses import ORJSONResponse, pagination_info
+from src.services.cache_service import cache_swr
+from src.utils.url_utils import compute_url_hash, compute_url_hashes
 
 
 router = APIRouter()
 
-
-def compute_url_hash(url: str) -> str:
-    """Compute SHA256 hash of URL for deduplication."""
-    return hashlib.sha256(url.encode('utf-8')).hexdigest()
-
-
-@router.post("", response_model=ApiResponse[CrawlTaskResponse], status_code=201)
+# Sortable list_tasks fields, resolved to columns once at import
+SORT_COLUMNS = {
+    name: getattr(CrawlTask, name)
+    for name in (
+        'id', 'created_at', 'updated_at', 'scheduled_at',
+        'completed_at', 'priority', 'status', 'retry_count'
+    )
+}
+
+# Per-process cache of (domain_name, is_active) rows for task submission.
+# Only existing domains are cached; entries go stale after 30 seconds.
+_domain_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+async def get_domain_status(db: AsyncSession, domain_id: int):
+    """Get a domain's (domain_name, is_active) row, or None if it does not exist."""
+    domain = _domain_cache.get(domain_id)
+    if domain is None:
+        domain = (
+            await db.execute(
+                select(Domain.domain_name, Domain.is_active)
+                .where(Domain.id == domain_id)
+            )
+        ).first()
+        if domain is not None:
+            _domain_cache[domain_id] = domain
+    return domain
+
+
+def _task_summary(task, domain_name: str) -> dict:
+    """Build task list-view payload from an ORM instance or task row."""
+    return {
+        "id": task.id,
+        "domain_id": task.domain_id,
+        "domain_name": domain_name,
+        "url": task.url,
+        "url_hash": task.url_hash.hex(),
+        "status": task.status,
+        "priority": task.priority,
+        "scheduled_at": task.scheduled_at,
+        "started_at": task.started_at,
+        "completed_at": task.completed_at,
+        "retry_count": task.retry_count,
+        "response_time_ms": task.response_time_ms,
+        "created_at": task.created_at
+    }
+
+
+def _task_detail(task: CrawlTask, domain_name: str, proxy_url: Optional[str]) -> dict:
+    """Build detailed task payload from ORM instance."""
+    return {
+        "id": task.id,
+        "domain_id": task.domain_id,
+        "domain_name": domain_name,
+        "url": task.url,
+        "url_hash": task.url_hash.hex(),
+        "status": task.status,
+        "priority": task.priority,
+        "scheduled_at": task.scheduled_at,
+        "started_at": task.started_at,
+        "completed_at": task.completed_at,
+        "retry_count": task.retry_count,
+        "max_retries": task.max_retries,
+        "error_message": task.error_message,
+        "crawl_frequency": str(task.crawl_frequency) if task.crawl_frequency else None,
+        "next_crawl_at": task.next_crawl_at,
+        "recrawl_count": task.recrawl_count,
+        "is_recurring": task.is_recurring,
+        "html_path": task.html_path,
+        "http_status_code": task.http_status_code,
+        "response_time_ms": task.response_time_ms,
+        "proxy_id": task.proxy_id,
+        "proxy_url": proxy_url,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "created_by": task.created_by
+    }
+
+
+@router.post("", response_model=CrawlTaskApiResponse, status_code=201)
 async def create_crawl_task(
     task_data: CrawlTaskCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit a new URL for crawling.
 
     Creates a new crawl task with the specified parameters. The URL will be
-    deduplicated using SHA256 hash to prevent duplicate crawls.
+    deduplicated by URL hash to prevent duplicate crawls.
 
     **Returns:**
     - 201: Task created successfully
@@ -47,103 +127,210 @@ async def create_crawl_task(
     - 404: Domain not found
     - 409: URL already exists (duplicate)
     """
-    # Verify domain exists
-    domain = db.query(Domain).filter(Domain.id == task_data.domain_id).first()
+    # Verify domain exists (only the columns checked and rendered)
+    domain = await get_domain_status(db, task_data.domain_id)
     if not domain:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_NOT_FOUND",
-                    "message": f"Domain with ID {task_data.domain_id} not found"
-                }
-            }
-        )
+        raise ApiError(404, "DOMAIN_NOT_FOUND", f"Domain with ID {task_data.domain_id} not found")
 
     # Check if domain is active
     if not domain.is_active:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DOMAIN_INACTIVE",
-                    "message": f"Domain {domain.domain_name} is currently disabled"
-                }
-            }
-        )
+        raise ApiError(400, "DOMAIN_INACTIVE", f"Domain {domain.domain_name} is currently disabled")
 
     # Compute URL hash for deduplication
     url_str = str(task_data.url)
     url_hash = compute_url_hash(url_str)
 
-    # Check for duplicate URL
-    existing_task = db.query(CrawlTask).filter(CrawlTask.url_hash == url_hash).first()
-    if existing_task:
-        raise HTTPException(
-            status_code=409,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "DUPLICATE_URL",
-                    "message": f"URL already exists with task ID {existing_task.id}",
-                    "details": {
-                        "existing_task_id": existing_task.id,
-                        "existing_status": existing_task.status
-                    }
-                }
+    # Insert unless the URL hash already exists; the unique index makes the
+    # dedup check and the insert one atomic statement
+    new_task = await db.scalar(
+        insert(CrawlTask).values(
+            domain_id=task_data.domain_id,
+            url=url_str,
+            url_hash=url_hash,
+            priority=task_data.priority,
+            scheduled_at=task_data.scheduled_at or utc_now(),
+            crawl_frequency=task_data.crawl_frequency,
+            is_recurring=task_data.is_recurring,
+            max_retries=task_data.max_retries,
+            status=CrawlTaskStatus.PENDING.value,
+            retry_count=0
+        ).on_conflict_do_nothing(
+            index_elements=["url_hash"]
+        ).returning(CrawlTask)
+    )
+
+    if new_task is None:
+        existing_task = (
+            await db.execute(
+                select(CrawlTask.id, CrawlTask.status)
+                .where(CrawlTask.url_hash == url_hash)
+            )
+        ).first()
+        if existing_task is None:
+            # The conflicting task was deleted between the two statements
+            raise ApiError(409, "DUPLICATE_URL", "URL already exists")
+        raise ApiError(
+            409,
+            "DUPLICATE_URL",
+            f"URL already exists with task ID {existing_task.id}",
+            details={
+                "existing_task_id": existing_task.id,
+                "existing_status": existing_task.status
             }
         )
 
-    # Create new crawl task
-    new_task = CrawlTask(
-        domain_id=task_data.domain_id,
-        url=url_str,
-        url_hash=url_hash,
-        priority=task_data.priority,
-        scheduled_at=task_data.scheduled_at or datetime.utcnow(),
-        crawl_frequency=task_data.crawl_frequency,
-        is_recurring=task_data.is_recurring,
-        max_retries=task_data.max_retries,
-        status="pending",
-        retry_count=0,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
+    await db.commit()
 
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
-
-    # Build response
-    response_data = CrawlTaskResponse(
-        id=new_task.id,
-        domain_id=new_task.domain_id,
-        domain_name=domain.domain_name,
-        url=new_task.url,
-        url_hash=new_task.url_hash,
-        status=new_task.status,
-        priority=new_task.priority,
-        scheduled_at=new_task.scheduled_at,
-        started_at=new_task.started_at,
-        completed_at=new_task.completed_at,
-        retry_count=new_task.retry_count,
-        response_time_ms=new_task.response_time_ms,
-        created_at=new_task.created_at
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": _task_summary(new_task, domain.domain_name),
+            "message": "Task created successfully"
+        },
+        status_code=201
     )
 
-    return ApiResponse(
-        success=True,
-        data=response_data,
-        message="Task created successfully"
-    )
 
+@router.post("/bulk", response_model=DictApiResponse)
+async def create_crawl_tasks_bulk(
+    bulk_data: CrawlTaskBulkCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Submit many URLs for crawling in one request.
+
+    All domains are checked with one query and all valid tasks are inserted
+    with one statement. URLs that already exist (or repeat earlier in the
+    batch) are skipped as duplicates.
 
-@router.get("/{task_id}", response_model=ApiResponse[CrawlTaskDetailResponse])
+    **Returns:**
+    - 200: Per-task results, in request order, with status "created",
+      "duplicate" or "error"
+    """
+    tasks = bulk_data.tasks
+
+    # Fetch every referenced domain at once
+    domain_ids = {task.domain_id for task in tasks}
+    domains = {
+        row.id: row
+        for row in (
+            await db.execute(
+                select(Domain.id, Domain.domain_name, Domain.is_active)
+                .where(Domain.id.in_(domain_ids))
+            )
+        )
+    }
+
+    # Hash the whole batch up front
+    url_strs = [str(task.url) for task in tasks]
+    url_hashes = compute_url_hashes(url_strs)
+
+    results = []
+    values = []
+    batch_hashes = set()
+    # One timestamp for unscheduled tasks keeps every row's VALUES clause a bind
+    now = utc_now()
+    for index, (task, url_str) in enumerate(zip(tasks, url_strs)):
+        result = {"index": index, "url": url_str}
+        domain = domains.get(task.domain_id)
+        if domain is None:
+            result["status"] = "error"
+            result["error"] = {
+                "code": "DOMAIN_NOT_FOUND",
+                "message": f"Domain with ID {task.domain_id} not found"
+            }
+        elif not domain.is_active:
+            result["status"] = "error"
+            result["error"] = {
+                "code": "DOMAIN_INACTIVE",
+                "message": f"Domain {domain.domain_name} is currently disabled"
+            }
+        elif url_hashes[index] in batch_hashes:
+            # Repeated within the batch: resolved with the first occurrence
+            result["url_hash"] = url_hashes[index]
+        else:
+            result["url_hash"] = url_hashes[index]
+            batch_hashes.add(result["url_hash"])
+            values.append({
+                "domain_id": task.domain_id,
+                "url": url_str,
+                "url_hash": result["url_hash"],
+                "priority": task.priority,
+                "scheduled_at": task.scheduled_at or now,
+                "crawl_frequency": task.crawl_frequency,
+                "is_recurring": task.is_recurring,
+                "max_retries": task.max_retries,
+                "status": CrawlTaskStatus.PENDING.value,
+                "retry_count": 0
+            })
+        results.append(result)
+
+    # Insert all valid tasks in one statement; existing URL hashes are skipped
+    created = {}
+    if values:
+        created = {
+            row.url_hash: row.id
+            for row in (
+                await db.execute(
+                    insert(CrawlTask).values(values)
+                    .on_conflict_do_nothing(index_elements=["url_hash"])
+                    .returning(CrawlTask.id, CrawlTask.url_hash)
+                )
+            )
+        }
+        await db.commit()
+
+    # Resolve duplicates to the task that already holds the URL
+    duplicate_hashes = {
+        result["url_hash"] for result in results
+        if "url_hash" in result and result["url_hash"] not in created
+    }
+    existing = {}
+    if duplicate_hashes:
+        existing = {
+            row.url_hash: row.id
+            for row in (
+                await db.execute(
+                    select(CrawlTask.id, CrawlTask.url_hash)
+                    .where(CrawlTask.url_hash.in_(duplicate_hashes))
+                )
+            )
+        }
+
+    created_count = 0
+    reported = set()
+    for result in results:
+        url_hash = result.pop("url_hash", None)
+        if url_hash is None:
+            continue
+        task_id = created.get(url_hash)
+        if task_id is not None and url_hash not in reported:
+            # First occurrence of a newly inserted URL
+            result["status"] = "created"
+            result["task_id"] = task_id
+            reported.add(url_hash)
+            created_count += 1
+        else:
+            result["status"] = "duplicate"
+            result["existing_task_id"] = task_id or existing.get(url_hash)
+
+    return ORJSONResponse({
+        "success": True,
+        "data": {
+            "created": created_count,
+            "duplicates": sum(result["status"] == "duplicate" for result in results),
+            "errors": sum(result["status"] == "error" for result in results),
+            "results": results
+        },
+        "message": f"{created_count} of {len(tasks)} tasks created"
+    })
+
+
+@router.get("/{task_id}", response_model=CrawlTaskDetailApiResponse)
+@cache_swr(key_fn=lambda **kw: f"task:{kw['task_id']}:detail", ttl=10, stale_ttl=10)
 async def get_task_details(
     task_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a specific crawl task.
@@ -151,68 +338,48 @@ async def get_task_details(
     Retrieves complete task details including domain info, proxy info,
     timing information, and error messages if any.
 
+    Cached for a few seconds; status changes made by workers are not
+    invalidated, so polled details may lag by up to 20 seconds. Also
+    served for HEAD.
+
     **Returns:**
     - 200: Task details retrieved successfully
     - 404: Task not found
     """
-    # Query with joins to get domain and proxy info
-    task = db.query(CrawlTask)\
-        .options(joinedload(CrawlTask.domain))\
-        .options(joinedload(CrawlTask.proxy))\
-        .filter(CrawlTask.id == task_id)\
-        .first()
-
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "TASK_NOT_FOUND",
-                    "message": f"Task with ID {task_id} not found"
-                }
-            }
+    # Join in only the domain and proxy columns the response needs;
+    # raiseload guards against the relationships being lazy-loaded.
+    # lambda_stmt builds and caches the statement once; task_id is bound.
+    row = (
+        await db.execute(
+            lambda_stmt(
+                lambda: select(CrawlTask, Domain.domain_name, Proxy.proxy_url)
+                .join(Domain, CrawlTask.domain_id == Domain.id)
+                .outerjoin(Proxy, CrawlTask.proxy_id == Proxy.id)
+                .options(raiseload("*"))
+                .where(CrawlTask.id == task_id)
+            )
         )
+    ).first()
 
-    # Build detailed response
-    response_data = CrawlTaskDetailResponse(
-        id=task.id,
-        domain_id=task.domain_id,
-        domain_name=task.domain.domain_name if task.domain else None,
-        url=task.url,
-        url_hash=task.url_hash,
-        status=task.status,
-        priority=task.priority,
-        scheduled_at=task.scheduled_at,
-        started_at=task.started_at,
-        completed_at=task.completed_at,
-        retry_count=task.retry_count,
-        max_retries=task.max_retries,
-        error_message=task.error_message,
-        crawl_frequency=str(task.crawl_frequency) if task.crawl_frequency else None,
-        next_crawl_at=task.next_crawl_at,
-        recrawl_count=task.recrawl_count,
-        is_recurring=task.is_recurring,
-        html_path=task.html_path,
-        http_status_code=task.http_status_code,
-        response_time_ms=task.response_time_ms,
-        proxy_id=task.proxy_id,
-        proxy_url=task.proxy.proxy_url if task.proxy else None,
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-        created_by=task.created_by
-    )
+    if row is None:
+        raise ApiError(404, "TASK_NOT_FOUND", f"Task with ID {task_id} not found")
+    task = row.CrawlTask
 
-    return ApiResponse(
-        success=True,
-        data=response_data
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": _task_detail(task, row.domain_name, row.proxy_url)
+    })
+
+
+router.add_api_route(
+    "/{task_id}", get_task_details, methods=["HEAD"], include_in_schema=False
+)
 
 
-@router.get("", response_model=PaginatedResponse[CrawlTaskResponse])
+@router.get("", response_model=CrawlTaskListResponse)
 async def list_tasks(
     domain_id: Optional[int] = Query(None, ge=1, description="Filter by domain"),
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status: Optional[CrawlTaskStatus] = Query(None, description="Filter by status"),
     priority_min: Optional[int] = Query(None, ge=1, le=10, description="Minimum priority"),
     priority_max: Optional[int] = Query(None, ge=1, le=10, description="Maximum priority"),
     created_after: Optional[datetime] = Query(None, description="Created after timestamp"),
@@ -221,8 +388,8 @@ async def list_tasks(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Results per page"),
     sort_by: str = Query("created_at", description="Sort field"),
-    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
+    sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List crawl tasks with filtering, sorting, and pagination.
@@ -234,32 +401,21 @@ async def list_tasks(
     - 200: Tasks list with pagination metadata
     """
     # Validate sort field
-    allowed_sort_fields = [
-        'id', 'created_at', 'updated_at', 'scheduled_at',
-        'completed_at', 'priority', 'status', 'retry_count'
-    ]
-    if sort_by not in allowed_sort_fields:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "success": False,
-                "error": {
-                    "code": "INVALID_SORT_FIELD",
-                    "message": f"Invalid sort field: {sort_by}",
-                    "details": {"allowed_fields": allowed_sort_fields}
-                }
-            }
+    sort_column = SORT_COLUMNS.get(sort_by)
+    if sort_column is None:
+        raise ApiError(
+            400,
+            "INVALID_SORT_FIELD",
+            f"Invalid sort field: {sort_by}",
+            details={"allowed_fields": list(SORT_COLUMNS)}
         )
 
-    # Build query with filters
-    query = db.query(CrawlTask).options(joinedload(CrawlTask.domain))
-
-    # Apply filters
+    # Build filters
     filters = []
     if domain_id is not None:
         filters.append(CrawlTask.domain_id == domain_id)
     if status is not None:
-        filters.append(CrawlTask.status == status)
+        filters.append(CrawlTask.status == status.value)
     if priority_min is not None:
         filters.append(CrawlTask.priority >= priority_min)
     if priority_max is not None:
@@ -271,55 +427,53 @@ async def list_tasks(
     if is_recurring is not None:
         filters.append(CrawlTask.is_recurring == is_recurring)
 
-    if filters:
-        query = query.filter(and_(*filters))
-
-    # Get total count before pagination
-    total_count = query.count()
+    # Select response columns (domain name joined in) with the filtered
+    # total as a window count. The lambda_stmt base is built once; filters
+    # and ordering are appended per request and cached per query shape.
+    query = lambda_stmt(lambda: select(
+        CrawlTask.id,
+        CrawlTask.domain_id,
+        Domain.domain_name,
+        CrawlTask.url,
+        CrawlTask.url_hash,
+        CrawlTask.status,
+        CrawlTask.priority,
+        CrawlTask.scheduled_at,
+        CrawlTask.started_at,
+        CrawlTask.completed_at,
+        CrawlTask.retry_count,
+        CrawlTask.response_time_ms,
+        CrawlTask.created_at,
+        func.count().over().label("total_count")
+    ).join(Domain, CrawlTask.domain_id == Domain.id))
+    for criterion in filters:
+        query += lambda s: s.where(criterion)
 
-    # Apply sorting
-    sort_column = getattr(CrawlTask, sort_by)
     if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
+        ordering = sort_column.desc()
     else:
-        query = query.order_by(asc(sort_column))
+        ordering = sort_column.asc()
 
-    # Apply pagination
+    # Apply ordering and pagination
     offset = (page - 1) * per_page
-    tasks = query.offset(offset).limit(per_page).all()
-
-    # Build response list
-    task_responses = [
-        CrawlTaskResponse(
-            id=task.id,
-            domain_id=task.domain_id,
-            domain_name=task.domain.domain_name if task.domain else None,
-            url=task.url,
-            url_hash=task.url_hash,
-            status=task.status,
-            priority=task.priority,
-            scheduled_at=task.scheduled_at,
-            started_at=task.started_at,
-            completed_at=task.completed_at,
-            retry_count=task.retry_count,
-            response_time_ms=task.response_time_ms,
-            created_at=task.created_at
+    query += lambda s: s.order_by(ordering).offset(offset).limit(per_page)
+    rows = (await db.execute(query)).all()
+
+    if rows:
+        total_count = rows[0].total_count
+    elif page > 1:
+        # Past the last page: no rows to carry the window count
+        total_count = await db.scalar(
+            select(func.count(CrawlTask.id)).where(*filters)
         )
-        for task in tasks
-    ]
-
-    # Calculate pagination info
-    total_pages = (total_count + per_page - 1) // per_page
+    else:
+        total_count = 0
 
-    pagination = PaginationInfo(
-        page=page,
-        per_page=per_page,
-        total=total_count,
-        total_pages=total_pages
-    )
+    # Build response list from plain rows (no ORM instances)
+    task_responses = [_task_summary(row, row.domain_name) for row in rows]
 
-    return PaginatedResponse(
-        success=True,
-        data=task_responses,
-        pagination=pagination
-    )
+    return ORJSONResponse({
+        "success": True,
+        "data": task_responses,
+        "pagination": pagination_info(page, per_page, total_count)
+    })
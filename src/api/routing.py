@@ -0,0 +1,135 @@
+"""
+Segment-trie route dispatch.
+
+Starlette tries every route's regex in order until one matches. TrieRouter
+indexes routes by their literal path segments so each request only runs
+the regexes of routes whose shape can match its path.
+"""
+
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRouter
+from starlette.routing import BaseRoute, Match, get_route_path
+from starlette.types import Receive, Scope, Send
+
+
+# Trie key for a "{param}" segment
+PARAM = object()
+
+
+class _Node:
+    """Trie node: literal children, a parameter child, and routes ending here."""
+
+    __slots__ = ("children", "param", "routes")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.routes: list[tuple[int, BaseRoute]] = []
+
+
+class TrieRouter(APIRouter):
+    """
+    APIRouter that narrows route matching with a prefix trie.
+
+    Routes are keyed by path segment, with "{param}" segments as wildcards.
+    Candidate routes keep their registration order and are still confirmed
+    with route.matches(), so matching semantics are unchanged. Routes without
+    a plain path (mounts, "{name:path}" converters) are always candidates.
+    Requests with no full or partial match fall back to the default router
+    (trailing-slash redirects and 404).
+    """
+
+    _trie: Optional[_Node] = None
+    _fallback: list[tuple[int, BaseRoute]] = []
+    _indexed_count: int = -1
+
+    def _build_index(self) -> None:
+        """Index self.routes into the segment trie."""
+        root = _Node()
+        fallback = []
+        for position, route in enumerate(self.routes):
+            path = getattr(route, "path", None)
+            if path is None or ":path}" in path or not hasattr(route, "endpoint"):
+                fallback.append((position, route))
+                continue
+            node = root
+            for segment in path.split("/"):
+                if "{" in segment:
+                    if node.param is None:
+                        node.param = _Node()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, _Node())
+            node.routes.append((position, route))
+        self._trie = root
+        self._fallback = fallback
+        self._indexed_count = len(self.routes)
+
+    def candidates(self, path: str) -> list[BaseRoute]:
+        """Get routes that may match path, in registration order."""
+        if self._indexed_count != len(self.routes):
+            self._build_index()
+
+        segments = path.split("/")
+        found = list(self._fallback)
+        nodes = [self._trie]
+        for segment in segments:
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                if node.param is not None:
+                    next_nodes.append(node.param)
+            if not next_nodes:
+                break
+            nodes = next_nodes
+        else:
+            for node in nodes:
+                found.extend(node.routes)
+
+        found.sort(key=lambda item: item[0])
+        return [route for _, route in found]
+
+    async def app(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await super().app(scope, receive, send)
+            return
+
+        if "router" not in scope:
+            scope["router"] = self
+
+        partial = None
+        partial_scope = None
+        for route in self.candidates(get_route_path(scope)):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+            elif match == Match.PARTIAL and partial is None:
+                partial = route
+                partial_scope = child_scope
+
+        if partial is not None:
+            # e.g. 405 Method Not Allowed
+            scope.update(partial_scope)
+            await partial.handle(scope, receive, send)
+            return
+
+        await super().app(scope, receive, send)
+
+
+def use_trie_router(app: FastAPI) -> None:
+    """
+    Swap the app's router for a TrieRouter, keeping its routes and settings.
+
+    Call before app.include_router(); routers included afterwards are
+    indexed on the next request.
+    """
+    router = TrieRouter.__new__(TrieRouter)
+    router.__dict__.update(app.router.__dict__)
+    router.middleware_stack = router.app
+    app.router = router
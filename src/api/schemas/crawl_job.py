@@ -4,9 +4,19 @@ Crawl task/job request and response schemas.
 Used for task submission, retrieval, and filtering.
 """
 
+import re
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from typing import Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+
+from src.api.schemas.response import ApiResponse, PaginatedResponse
+
+
+# "<count> <unit>" with an optional plural "s", e.g. "1 day", "6 hours"
+INTERVAL_PATTERN = re.compile(
+    r"^\s*(\d+)\s+(second|minute|hour|day|week|month|year)s?\s*$",
+    re.IGNORECASE
+)
 
 
 class CrawlTaskCreate(BaseModel):
@@ -20,22 +30,29 @@ class CrawlTaskCreate(BaseModel):
     is_recurring: bool = Field(True, description="Auto-schedule next crawl")
     max_retries: int = Field(3, ge=0, le=10, description="Max retry attempts")
 
+    model_config = ConfigDict(extra="forbid")
+
     @field_validator('crawl_frequency')
     @classmethod
     def validate_interval(cls, v: str) -> str:
-        """Validate PostgreSQL interval format."""
-        # Basic validation - could be more strict
-        valid_units = ['second', 'minute', 'hour', 'day', 'week', 'month', 'year']
-        parts = v.lower().split()
-        if len(parts) != 2:
+        """Validate PostgreSQL interval format and normalize it to '<n> <unit>'."""
+        match = INTERVAL_PATTERN.match(v)
+        if not match:
             raise ValueError(f"Invalid interval format: {v}. Expected format: '1 day'")
-        try:
-            int(parts[0])
-        except ValueError:
-            raise ValueError(f"Invalid interval number: {parts[0]}")
-        if not any(unit in parts[1] for unit in valid_units):
-            raise ValueError(f"Invalid interval unit: {parts[1]}")
-        return v
+        return f"{match.group(1)} {match.group(2).lower()}"
+
+
+class CrawlTaskBulkCreate(BaseModel):
+    """Request schema for submitting many crawl tasks at once."""
+
+    tasks: list[CrawlTaskCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Tasks to create (up to 1000)"
+    )
+
+    model_config = ConfigDict(extra="forbid")
 
 
 class CrawlTaskResponse(BaseModel):
@@ -45,7 +62,7 @@ class CrawlTaskResponse(BaseModel):
     domain_id: int = Field(..., description="Domain ID")
     domain_name: Optional[str] = Field(None, description="Domain name")
     url: str = Field(..., description="Target URL")
-    url_hash: str = Field(..., description="SHA256 hash of URL")
+    url_hash: str = Field(..., description="xxh3-128 hash of URL (hex)")
     status: str = Field(..., description="Current task status")
     priority: int = Field(..., description="Priority (1-10)")
     scheduled_at: Optional[datetime] = Field(None, description="When task is scheduled")
@@ -55,8 +72,7 @@ class CrawlTaskResponse(BaseModel):
     response_time_ms: Optional[int] = Field(None, description="Response time in milliseconds")
     created_at: datetime = Field(..., description="When task was created")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CrawlTaskDetailResponse(BaseModel):
@@ -88,8 +104,7 @@ class CrawlTaskDetailResponse(BaseModel):
     updated_at: datetime
     created_by: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CrawlTaskFilter(BaseModel):
@@ -105,7 +120,7 @@ class CrawlTaskFilter(BaseModel):
     page: int = Field(1, ge=1, description="Page number")
     per_page: int = Field(20, ge=1, le=100, description="Results per page")
     sort_by: str = Field("created_at", description="Sort field")
-    sort_order: str = Field("desc", pattern="^(asc|desc)$", description="Sort order")
+    sort_order: Literal["asc", "desc"] = Field("desc", description="Sort order")
 
     @field_validator('sort_by')
     @classmethod
@@ -118,3 +133,16 @@ class CrawlTaskFilter(BaseModel):
         if v not in allowed_fields:
             raise ValueError(f"Invalid sort field: {v}. Allowed: {allowed_fields}")
         return v
+
+
+# Response envelopes
+class CrawlTaskApiResponse(ApiResponse[CrawlTaskResponse]):
+    pass
+
+
+class CrawlTaskDetailApiResponse(ApiResponse[CrawlTaskDetailResponse]):
+    pass
+
+
+class CrawlTaskListResponse(PaginatedResponse[CrawlTaskResponse]):
+    pass
@@ -5,15 +5,25 @@ Used for domain configuration and management.
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, HttpUrl
+from typing import Annotated, Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+from src.api.schemas.response import ApiResponse, PaginatedResponse
+
+
+# http(s) URL with no whitespace; checked by pydantic-core's regex engine
+# instead of building a full HttpUrl object per request
+BaseUrl = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, min_length=8, max_length=512, pattern=r"^https?://[^\s/]+[^\s]*$")
+]
 
 
 class DomainCreate(BaseModel):
     """Request schema for creating a new domain."""
 
     domain_name: str = Field(..., min_length=1, max_length=255, description="Domain name (e.g., amazon.com)")
-    base_url: HttpUrl = Field(..., description="Base URL (e.g., https://www.amazon.com)")
+    base_url: BaseUrl = Field(..., description="Base URL (e.g., https://www.amazon.com)")
     parser_name: str = Field(..., min_length=1, max_length=100, description="Parser identifier")
     crawl_delay_seconds: int = Field(1, ge=0, le=60, description="Delay between requests (seconds)")
     max_concurrent_requests: int = Field(5, ge=1, le=100, description="Max concurrent requests")
@@ -21,6 +31,8 @@ class DomainCreate(BaseModel):
     user_agent: str = Field("ProductCrawler/1.0", max_length=255, description="User agent string")
     robots_txt_url: Optional[str] = Field(None, description="robots.txt URL (optional)")
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class DomainUpdate(BaseModel):
     """Request schema for updating domain settings."""
@@ -31,6 +43,8 @@ class DomainUpdate(BaseModel):
     is_active: Optional[bool] = None
     user_agent: Optional[str] = Field(None, max_length=255)
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class DomainResponse(BaseModel):
     """Response schema for domain (list view)."""
@@ -43,8 +57,7 @@ class DomainResponse(BaseModel):
     active_proxies: int = 0
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DomainDetailResponse(BaseModel):
@@ -65,5 +78,13 @@ class DomainDetailResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Response envelopes
+class DomainApiResponse(ApiResponse[DomainDetailResponse]):
+    pass
+
+
+class DomainListResponse(PaginatedResponse[DomainResponse]):
+    pass
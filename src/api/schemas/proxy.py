@@ -5,8 +5,10 @@ Used for proxy pool management.
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.api.schemas.response import ApiResponse, PaginatedResponse
 
 
 class ProxyCreate(BaseModel):
@@ -14,7 +16,7 @@ class ProxyCreate(BaseModel):
 
     proxy_url: str = Field(..., min_length=1, max_length=255, description="Proxy hostname or IP")
     proxy_port: int = Field(..., ge=1, le=65535, description="Proxy port")
-    proxy_protocol: str = Field("http", pattern="^(http|https|socks5)$", description="Proxy protocol")
+    proxy_protocol: Literal["http", "https", "socks5"] = Field("http", description="Proxy protocol")
     proxy_username: Optional[str] = Field(None, max_length=100, description="Proxy username")
     proxy_password: Optional[str] = Field(None, max_length=255, description="Proxy password")
     country_code: Optional[str] = Field(None, min_length=2, max_length=2, description="ISO country code")
@@ -23,6 +25,8 @@ class ProxyCreate(BaseModel):
     monthly_cost: Optional[float] = Field(None, ge=0, description="Monthly cost in USD")
     max_requests_per_hour: Optional[int] = Field(None, ge=0, description="Rate limit")
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class ProxyUpdate(BaseModel):
     """Request schema for updating proxy settings."""
@@ -33,6 +37,8 @@ class ProxyUpdate(BaseModel):
     proxy_username: Optional[str] = Field(None, max_length=100)
     proxy_password: Optional[str] = Field(None, max_length=255)
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class ProxyResponse(BaseModel):
     """Response schema for proxy (list view)."""
@@ -49,8 +55,7 @@ class ProxyResponse(BaseModel):
     avg_response_time_ms: Optional[int] = None
     last_used_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProxyDetailResponse(BaseModel):
@@ -76,8 +81,7 @@ class ProxyDetailResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DomainProxyAssign(BaseModel):
@@ -86,6 +90,8 @@ class DomainProxyAssign(BaseModel):
     proxy_ids: list[int] = Field(..., min_length=1, description="List of proxy IDs to assign")
     priority: int = Field(5, ge=1, le=10, description="Priority for all proxies")
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class DomainProxyResponse(BaseModel):
     """Response schema for domain-proxy mapping."""
@@ -102,8 +108,7 @@ class DomainProxyResponse(BaseModel):
     avg_response_time_ms: Optional[int] = None
     last_used_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DomainProxyStatsResponse(BaseModel):
@@ -120,3 +125,16 @@ class DomainProxyStatsResponse(BaseModel):
     total_success: int
     total_failures: int
     proxy_distribution: dict[str, int]
+
+
+# Response envelopes
+class ProxyApiResponse(ApiResponse[ProxyDetailResponse]):
+    pass
+
+
+class ProxyListResponse(PaginatedResponse[ProxyResponse]):
+    pass
+
+
+class DomainProxyStatsApiResponse(ApiResponse[DomainProxyStatsResponse]):
+    pass
@@ -5,7 +5,7 @@ Provides standardized response formats for success, errors, and pagination.
 """
 
 from typing import Generic, TypeVar, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 DataT = TypeVar('DataT')
@@ -13,6 +13,8 @@ DataT = TypeVar('DataT')
 
 class PaginationInfo(BaseModel):
     """Pagination metadata."""
+    model_config = ConfigDict(frozen=True)
+
     page: int = Field(..., ge=1, description="Current page number")
     per_page: int = Field(..., ge=1, le=100, description="Items per page")
     total: int = Field(..., ge=0, description="Total number of items")
@@ -21,6 +23,8 @@ class PaginationInfo(BaseModel):
 
 class ErrorDetail(BaseModel):
     """Error detail structure."""
+    model_config = ConfigDict(frozen=True)
+
     code: str = Field(..., description="Error code (e.g., TASK_NOT_FOUND)")
     message: str = Field(..., description="Human-readable error message")
     details: Optional[dict[str, Any]] = Field(None, description="Additional error context")
@@ -48,3 +52,13 @@ class PaginatedResponse(BaseModel, Generic[DataT]):
     data: list[DataT] = Field(..., description="List of items")
     pagination: PaginationInfo = Field(..., description="Pagination metadata")
     message: Optional[str] = Field(None, description="Optional message")
+
+
+# Routes use concrete subclasses (e.g. DomainApiResponse) as response_model,
+# so each parameterization is built once at import under a stable OpenAPI name
+class DictApiResponse(ApiResponse[dict]):
+    """Response wrapper for endpoints returning an ad-hoc object."""
+
+
+class EmptyApiResponse(ApiResponse[None]):
+    """Response wrapper for endpoints returning no data."""
@@ -4,30 +4,75 @@ Database configuration and session management.
 Provides SQLAlchemy engine, session factory, and Base class for models.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-from src.core.config import settings
-
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.get_database_url_sync(),
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,        # Connection pool size
-    max_overflow=20,     # Max overflow connections
-    echo=False,          # Set to True for SQL query logging
-)
+from datetime import datetime, timezone
+from functools import lru_cache
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
+from typing import AsyncGenerator, Generator
+from src.core.config import get_settings
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """Get the sync SQLAlchemy engine, creating it on first use."""
+    settings = get_settings()
+    return create_engine(
+        settings.get_database_url_sync(),
+        pool_pre_ping=True,  # Verify connections before using
+        pool_size=20,        # Connection pool size
+        max_overflow=40,     # Max overflow connections
+        pool_timeout=30,     # Seconds to wait for a free connection
+        pool_recycle=settings.db_pool_recycle,  # Drop connections older than this
+        pool_use_lifo=True,  # Reuse warm connections; idle extras age out
+        query_cache_size=1200,  # Compiled statements kept per engine (default 500)
+        echo=False,          # Set to True for SQL query logging
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine for API request handlers (psycopg3 async driver),
+    creating it on first use.
+
+    Sized to this worker's share of the connection budget.
+    """
+    settings = get_settings()
+    api_pool_size, api_max_overflow = settings.get_api_pool_limits()
+    return create_async_engine(
+        settings.get_database_url_async(),
+        pool_pre_ping=True,
+        pool_size=api_pool_size,
+        max_overflow=api_max_overflow,
+        pool_timeout=30,
+        pool_recycle=settings.db_pool_recycle,
+        pool_use_lifo=True,
+        query_cache_size=1200,
+        echo=False,
+    )
+
 
-# Create session factory
+# Session factories; sessions are bound to the engine when opened, e.g.
+# SessionLocal(bind=get_engine()), so importing models creates no engine
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False  # Keep loaded attributes usable after commit
+)
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False
 )
 
-# Create declarative base for models
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base class for all models."""
+
+
+def utc_now() -> datetime:
+    """Current UTC time (Python-side default for timestamp columns)."""
+    return datetime.now(timezone.utc)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -46,13 +91,33 @@ def get_db() -> Generator[Session, None, None]:
     Ensures:
         Session is properly closed after use
     """
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function for FastAPI to get an async database session.
+
+    Queries are awaited, so the event loop keeps serving other requests
+    while waiting on PostgreSQL.
+
+    Usage in FastAPI endpoints:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            items = (await db.scalars(select(Item))).all()
+            return items
+
+    Yields:
+        Async database session
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
 def init_db():
     """
     Initialize database - create all tables.
@@ -64,18 +129,11 @@ def init_db():
         from src.core.database import init_db
         init_db()  # Creates all tables
     """
-    # Import all models to ensure they're registered with Base
-    from src.core.models import (
-        Domain,
-        CrawlTask,
-        Product,
-        Image,
-        Proxy,
-        DomainProxy
-    )
+    # Register every model's table with Base (deferred: models import Base)
+    import src.core.models  # noqa: F401
 
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
 def drop_all():
@@ -88,4 +146,6 @@ def drop_all():
         from src.core.database import drop_all
         drop_all()  # Drops all tables
     """
-    Base.metadata.drop_all(bind=engine)
+    import src.core.models  # noqa: F401
+
+    Base.metadata.drop_all(bind=get_engine())
@@ -1,8 +1,10 @@
+from datetime import timedelta
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Boolean, Interval, ForeignKey
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, TIMESTAMP, Boolean, Interval, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from src.core.database import Base
+from src.core.database import Base, utc_now
 
 
 class CrawlTaskStatus(str, Enum):
@@ -28,6 +30,27 @@ class CrawlTaskStatus(str, Enum):
     CANCELLED = "cancelled"          # Admin cancelled this task
 
 
+# Native PostgreSQL enum for crawl_tasks.status (values stay plain strings)
+crawl_task_status = ENUM(
+    *[status.value for status in CrawlTaskStatus],
+    name="crawl_task_status"
+)
+
+# Raw status strings for the state-transition methods
+_PENDING = CrawlTaskStatus.PENDING.value
+_CRAWLING = CrawlTaskStatus.CRAWLING.value
+_DOWNLOADED = CrawlTaskStatus.DOWNLOADED.value
+_COMPLETED = CrawlTaskStatus.COMPLETED.value
+_FAILED = CrawlTaskStatus.FAILED.value
+_CANCELLED = CrawlTaskStatus.CANCELLED.value
+
+# Statuses that end a task (see CrawlTask.is_terminal_state)
+TERMINAL_STATES = frozenset({_COMPLETED, _FAILED, _CANCELLED})
+
+# Retry delay after the n-th failure: 2**n minutes (max_retries is at most 10)
+RETRY_BACKOFF = tuple(timedelta(minutes=2 ** n) for n in range(11))
+
+
 class CrawlTask(Base):
     __tablename__ = "crawl_tasks"
 
@@ -39,7 +62,6 @@ class CrawlTask(Base):
         Integer,
         ForeignKey("domains.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         comment="Reference to domain"
     )
     proxy_id = Column(
@@ -57,26 +79,24 @@ class CrawlTask(Base):
         comment="Full URL to crawl"
     )
     url_hash = Column(
-        String(64),
+        LargeBinary(16),
         unique=True,
         nullable=False,
         index=True,
-        comment="SHA256 hash of URL (deduplication)"
+        comment="xxh3-128 digest of URL, 16 raw bytes (deduplication)"
     )
 
     # Status and priority
     status = Column(
-        String(50),
+        crawl_task_status,
         nullable=False,
-        index=True,
         default=CrawlTaskStatus.PENDING.value,
         comment="Current task status"
     )
     priority = Column(
-        Integer,
+        SmallInteger,
         default=5,
         nullable=False,
-        index=True,
         comment="Priority (1=highest, 10=lowest)"
     )
 
@@ -84,7 +104,6 @@ class CrawlTask(Base):
     scheduled_at = Column(
         TIMESTAMP(timezone=True),
         nullable=False,
-        index=True,
         comment="When to execute task"
     )
     started_at = Column(
@@ -166,14 +185,16 @@ class CrawlTask(Base):
     # Metadata
     created_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         comment="First creation time"
     )
     updated_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False,
         comment="Last update time"
     )
@@ -186,12 +207,36 @@ class CrawlTask(Base):
     )
 
     # Relationships
-    domain = relationship("Domain", back_populates="crawl_tasks")
-    proxy = relationship("Proxy", back_populates="crawl_tasks")
+    domain = relationship("Domain", back_populates="crawl_tasks", lazy="raise")
+    proxy = relationship("Proxy", back_populates="crawl_tasks", lazy="raise")
     products = relationship(
         "Product",
         back_populates="crawl_task",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise"
+    )
+
+    # Table constraints
+    __table_args__ = (
+        # Per-domain task listing filtered by status, newest first; its
+        # (domain_id) and (domain_id, status) prefixes serve per-domain
+        # counts and the domain FK, so neither column has its own index
+        Index('ix_tasks_domain_status_created', 'domain_id', 'status', 'created_at'),
+        # Scheduler pick: pending tasks by priority, then due time
+        Index(
+            'ix_tasks_ready',
+            'priority',
+            'scheduled_at',
+            postgresql_where=status == CrawlTaskStatus.PENDING.value
+        ),
+        # Default list ordering (created_at DESC via backward scan)
+        Index('ix_tasks_created_at', 'created_at'),
+        # Recurring tasks due for recrawl
+        Index(
+            'ix_tasks_recurring_due',
+            'next_crawl_at',
+            postgresql_where=is_recurring.is_(True) & next_crawl_at.is_not(None)
+        ),
     )
 
     def __repr__(self):
@@ -205,17 +250,13 @@ class CrawlTask(Base):
     @property
     def is_terminal_state(self) -> bool:
         """Check if task is in a terminal state."""
-        return self.status in [
-            CrawlTaskStatus.COMPLETED.value,
-            CrawlTaskStatus.FAILED.value,
-            CrawlTaskStatus.CANCELLED.value
-        ]
+        return self.status in TERMINAL_STATES
 
     @property
     def can_retry(self) -> bool:
         """Check if task can be retried."""
         return (
-            self.status == CrawlTaskStatus.FAILED.value
+            self.status == _FAILED
             and self.retry_count < self.max_retries
         )
 
@@ -229,8 +270,8 @@ class CrawlTask(Base):
 
     def mark_started(self):
         """Mark task as started."""
-        self.status = CrawlTaskStatus.CRAWLING.value
-        self.started_at = func.now()
+        self.status = _CRAWLING
+        self.started_at = utc_now()
 
     def mark_downloaded(self, html_path: str, http_status: int, response_time: int):
         """
@@ -241,21 +282,21 @@ class CrawlTask(Base):
             http_status: HTTP status code
             response_time: Response time in milliseconds
         """
-        self.status = CrawlTaskStatus.DOWNLOADED.value
+        self.status = _DOWNLOADED
         self.html_path = html_path
         self.http_status_code = http_status
         self.response_time_ms = response_time
 
     def mark_completed(self):
         """Mark task as completed."""
-        self.status = CrawlTaskStatus.COMPLETED.value
-        self.completed_at = func.now()
+        now = utc_now()
+        self.status = _COMPLETED
+        self.completed_at = now
         self.error_message = None
 
         # Schedule next crawl if recurring
         if self.is_recurring:
-            from datetime import datetime, timedelta
-            self.next_crawl_at = datetime.now() + self.crawl_frequency
+            self.next_crawl_at = now + self.crawl_frequency
 
     def mark_failed(self, error: str):
         """
@@ -268,11 +309,10 @@ class CrawlTask(Base):
         self.error_message = error
 
         if self.retry_count >= self.max_retries:
-            self.status = CrawlTaskStatus.FAILED.value
-            self.completed_at = func.now()
+            self.status = _FAILED
+            self.completed_at = utc_now()
         else:
             # Reset to pending for retry with exponential backoff
-            self.status = CrawlTaskStatus.PENDING.value
-            from datetime import datetime, timedelta
-            delay_minutes = 2 ** self.retry_count
-            self.scheduled_at = datetime.now() + timedelta(minutes=delay_minutes)
+            self.status = _PENDING
+            backoff = RETRY_BACKOFF[min(self.retry_count, len(RETRY_BACKOFF) - 1)]
+            self.scheduled_at = utc_now() + backoff
@@ -1,7 +1,8 @@
+from datetime import datetime
 from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, Text, Interval
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from src.core.database import Base
+from src.core.database import Base, utc_now
 
 
 class Domain(Base):
@@ -89,14 +90,16 @@ class Domain(Base):
     # Timestamps
     created_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         comment="Record creation time"
     )
     updated_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False,
         comment="Last update time"
     )
@@ -105,17 +108,23 @@ class Domain(Base):
     crawl_tasks = relationship(
         "CrawlTask",
         back_populates="domain",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
     )
     products = relationship(
         "Product",
         back_populates="domain",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
     )
     domain_proxies = relationship(
         "DomainProxy",
         back_populates="domain",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
     )
 
     def __repr__(self):
@@ -131,7 +140,6 @@ class Domain(Base):
         """Calculate how old the cached robots.txt is (in hours)."""
         if not self.robots_txt_last_fetched:
             return float('inf')
-        from datetime import datetime
         age = datetime.now(self.robots_txt_last_fetched.tzinfo) - self.robots_txt_last_fetched
         return age.total_seconds() / 3600
 
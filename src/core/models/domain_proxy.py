@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, Boolean, TIMESTAMP, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, Computed, Integer, SmallInteger, Boolean, Numeric, TIMESTAMP, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from src.core.database import Base
+from src.core.database import Base, utc_now
 
 
 class DomainProxy(Base):
@@ -15,7 +15,6 @@ class DomainProxy(Base):
         Integer,
         ForeignKey("domains.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         comment="Reference to domain"
     )
     proxy_id = Column(
@@ -37,7 +36,7 @@ class DomainProxy(Base):
 
     # Configuration
     priority = Column(
-        Integer,
+        SmallInteger,
         default=5,
         nullable=False,
         comment="Proxy priority for this domain (1=highest, 10=lowest)"
@@ -63,6 +62,20 @@ class DomainProxy(Base):
         nullable=False,
         comment="Failed requests for this domain"
     )
+    total_requests = Column(
+        Integer,
+        Computed("success_count + failure_count", persisted=True),
+        comment="Total requests for this domain (generated from counts)"
+    )
+    success_rate_percent = Column(
+        Numeric(5, 2),
+        Computed(
+            "CASE WHEN success_count + failure_count = 0 THEN 0 "
+            "ELSE round(100.0 * success_count / (success_count + failure_count), 2) END",
+            persisted=True
+        ),
+        comment="Success rate percentage for this domain (generated from counts)"
+    )
     avg_response_time_ms = Column(
         Integer,
         nullable=True,
@@ -72,21 +85,26 @@ class DomainProxy(Base):
     # Timestamps
     created_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         comment="Record creation time"
     )
     updated_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False,
         comment="Last update time"
     )
 
     # Relationships
-    domain = relationship("Domain", back_populates="domain_proxies")
-    proxy = relationship("Proxy", back_populates="domain_proxies")
+    domain = relationship("Domain", back_populates="domain_proxies", lazy="raise")
+    proxy = relationship("Proxy", back_populates="domain_proxies", lazy="raise")
+
+    # UPDATEs return the regenerated count columns instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
 
     # Table constraints
     __table_args__ = (
@@ -96,18 +114,33 @@ class DomainProxy(Base):
             'proxy_id',
             name='unique_domain_proxy'
         ),
-        # Composite indexes for LRU selection
+        # Composite index for per-domain active proxy lookups
+        Index('ix_dp_domain_active', 'domain_id', 'is_active'),
+        # Composite index for LRU selection
         Index('idx_domain_proxies_lru', 'domain_id', 'last_used_at'),
-        Index('idx_domain_proxies_priority_lru', 'domain_id', 'priority', 'last_used_at'),
+        # Proxy pick (proxy_service.pick_proxy): active mappings in pick
+        # order, carrying proxy_id and the response-time average so
+        # candidates and their latency are read from the index
+        Index(
+            'idx_domain_proxies_pick',
+            'domain_id',
+            'priority',
+            last_used_at.asc().nulls_first(),
+            postgresql_where=is_active.is_(True),
+            postgresql_include=['proxy_id', 'avg_response_time_ms']
+        ),
+        # Per-domain proxy listing ordered by success rate
+        Index('ix_dp_domain_success_rate', 'domain_id', 'success_rate_percent'),
     )
 
     def __repr__(self):
+        # Loaded state only: repr must never trigger a database load
+        state = self.__dict__
         return (
-            f"<DomainProxy(id={self.id}, "
-            f"domain_id={self.domain_id}, "
-            f"proxy_id={self.proxy_id}, "
-            f"is_active={self.is_active}, "
-            f"success_rate={self.success_rate:.2%})>"
+            f"<DomainProxy(id={state.get('id')}, "
+            f"domain_id={state.get('domain_id')}, "
+            f"proxy_id={state.get('proxy_id')}, "
+            f"is_active={state.get('is_active')})>"
         )
 
     @property
@@ -118,11 +151,6 @@ class DomainProxy(Base):
             return 0.0
         return self.success_count / total
 
-    @property
-    def total_requests(self) -> int:
-        """Total requests for this domain-proxy mapping."""
-        return self.success_count + self.failure_count
-
     def record_success(self, response_time_ms: int):
         """
         Record a successful request for this domain-proxy mapping.
@@ -132,14 +160,14 @@ class DomainProxy(Base):
         """
         self.success_count += 1
         self.failure_count = 0  # Reset consecutive failures
-        self.last_used_at = func.now()
+        self.last_used_at = utc_now()
 
-        # Update average response time (moving average)
+        # Update average response time (EWMA, new sample weighted 1/8)
         if self.avg_response_time_ms is None:
             self.avg_response_time_ms = response_time_ms
         else:
             self.avg_response_time_ms = (
-                (self.avg_response_time_ms + response_time_ms) // 2
+                (self.avg_response_time_ms * 7 + response_time_ms) // 8
             )
 
     def record_failure(self):
@@ -148,8 +176,8 @@ class DomainProxy(Base):
         Auto-disable after 5 consecutive failures.
         """
         self.failure_count += 1
-        self.last_used_at = func.now()
+        self.last_used_at = utc_now()
 
-        # Auto-disable after 5 consecutive failures
-        if self.failure_count >= 5:
+        # Auto-disable after 5 consecutive failures (assign only on a change)
+        if self.is_active and self.failure_count >= 5:
             self.is_active = False
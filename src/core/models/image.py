@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from src.core.database import Base
+from src.core.database import Base, utc_now
 
 
 class Image(Base):
@@ -71,13 +71,14 @@ class Image(Base):
     # Timestamp
     created_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         comment="Record creation time"
     )
 
     # Relationships
-    product = relationship("Product", back_populates="images")
+    product = relationship("Product", back_populates="images", lazy="raise")
 
     def __repr__(self):
         return (
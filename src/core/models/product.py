@@ -1,7 +1,24 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Numeric, ForeignKey, JSON
+import hashlib
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Numeric, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from src.core.database import Base
+from src.core.database import Base, utc_now
+
+
+# Fields covered by Product.content_hash, in digest order
+CONTENT_HASH_FIELDS = ("product_name", "price", "description", "availability")
+
+
+def _content_hash(values) -> bytes:
+    """BLAKE2b-256 over the field values, each behind a 0x1f separator."""
+    digest = hashlib.blake2b(digest_size=32)
+    for value in values:
+        digest.update(b'\x1f')
+        if value is not None:
+            digest.update(str(value).encode('utf-8'))
+    return digest.digest()
 
 
 class Product(Base):
@@ -33,11 +50,11 @@ class Product(Base):
         comment="Product page URL"
     )
     url_hash = Column(
-        String(64),
+        LargeBinary(16),
         unique=True,
         nullable=False,
         index=True,
-        comment="SHA256 hash of URL (deduplication)"
+        comment="xxh3-128 digest of URL, 16 raw bytes (deduplication)"
     )
 
     # Product attributes
@@ -109,14 +126,14 @@ class Product(Base):
 
     # Change detection
     content_hash = Column(
-        String(64),
+        LargeBinary(32),
         nullable=True,
-        comment="SHA256 hash of product data (detect changes)"
+        comment="BLAKE2b-256 digest of product data, 32 raw bytes (detect changes)"
     )
 
     # Flexible metadata
     extra_attributes = Column(
-        JSON,
+        JSONB,
         nullable=True,
         comment="Additional metadata (color, size, weight, etc.)"
     )
@@ -124,6 +141,7 @@ class Product(Base):
     # Timestamps
     created_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         index=True,
@@ -131,27 +149,42 @@ class Product(Base):
     )
     updated_at = Column(
         TIMESTAMP(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False,
         comment="Last updated timestamp"
     )
 
     # Relationships
-    domain = relationship("Domain", back_populates="products")
-    crawl_task = relationship("CrawlTask", back_populates="products")
+    domain = relationship("Domain", back_populates="products", lazy="raise")
+    crawl_task = relationship("CrawlTask", back_populates="products", lazy="raise")
     images = relationship(
         "Image",
         back_populates="product",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
+    )
+
+    # Table constraints
+    __table_args__ = (
+        # Attribute containment filters (extra_attributes @> '{"color": "red"}')
+        Index(
+            'idx_products_extra_attributes_gin',
+            'extra_attributes',
+            postgresql_using='gin',
+            postgresql_ops={'extra_attributes': 'jsonb_path_ops'}
+        ),
     )
 
     def __repr__(self):
+        # Loaded state only: repr must never trigger a database load
+        state = self.__dict__
         return (
-            f"<Product(id={self.id}, "
-            f"name='{self.product_name[:30]}...', "
-            f"price={self.price} {self.currency}, "
-            f"brand='{self.brand}')>"
+            f"<Product(id={state.get('id')}, "
+            f"name={(state.get('product_name') or '')[:30]!r}, "
+            f"price={state.get('price')} {state.get('currency')})>"
         )
 
     @property
@@ -172,13 +205,12 @@ class Product(Base):
     @property
     def age_days(self) -> int:
         """Calculate product age in days since first crawled."""
-        from datetime import datetime
         if not self.created_at:
             return 0
         age = datetime.now(self.created_at.tzinfo) - self.created_at
         return age.days
 
-    def compute_content_hash(self) -> str:
+    def compute_content_hash(self) -> bytes:
         """
         Compute content hash for change detection.
 
@@ -188,20 +220,35 @@ class Product(Base):
         - description
         - availability
 
+        Fields are fed to the digest one by one, each behind a separator,
+        so no concatenated string is built and adjacent fields cannot run
+        together.
+
         Returns:
-            SHA256 hash as hex string
+            32-byte BLAKE2b-256 digest
         """
-        import hashlib
-
-        content = (
-            f"{self.product_name or ''}"
-            f"{self.price or ''}"
-            f"{self.description or ''}"
-            f"{self.availability or ''}"
+        return _content_hash(
+            (self.product_name, self.price, self.description, self.availability)
         )
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    def has_changed(self, new_content_hash: str) -> bool:
+    @staticmethod
+    def bulk_content_hash(rows: list[dict]) -> list[bytes]:
+        """
+        Compute content hashes for scraped product rows before they are
+        loaded as Product instances (same hashes as compute_content_hash).
+
+        Args:
+            rows: Dicts keyed by CONTENT_HASH_FIELDS (missing keys hash as None)
+
+        Returns:
+            Digests in row order
+        """
+        return [
+            _content_hash([row.get(field) for field in CONTENT_HASH_FIELDS])
+            for row in rows
+        ]
+
+    def has_changed(self, new_content_hash: bytes) -> bool:
         """
         Check if product content has changed.
 
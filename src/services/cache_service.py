@@ -0,0 +1,196 @@
+"""
+Redis response cache with stale-while-revalidate semantics.
+
+Caches serialized JSON response bodies for read-heavy endpoints. Entries are
+fresh for `ttl` seconds; for a further `stale_ttl` seconds the stale body is
+still served while a single background task recomputes it. Each body is
+stored with its ETag so conditional requests can be answered with 304.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.core.config import get_settings
+from src.core.database import AsyncSessionLocal, get_async_engine
+
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[aioredis.Redis] = None
+
+# Strong references to in-flight refresh tasks (asyncio only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the shared async Redis client (created on first use)."""
+    global _client
+    if _client is None:
+        _client = aioredis.from_url(
+            get_settings().redis_url,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return _client
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a weak ETag from a response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def get_cached(key: str) -> Optional[tuple[bytes, float, str]]:
+    """
+    Get cached body, its fresh-until timestamp and its ETag.
+
+    Returns:
+        (body, fresh_until, etag) or None on miss or Redis error
+    """
+    try:
+        body, fresh_until, etag = await get_redis().hmget(key, "body", "fresh_until", "etag")
+    except RedisError as exc:
+        logger.warning("Cache read failed for %s: %s", key, exc)
+        return None
+    if body is None or fresh_until is None:
+        return None
+    return body, float(fresh_until), etag.decode() if etag else compute_etag(body)
+
+
+async def set_cached(key: str, body: bytes, ttl: int, stale_ttl: int) -> None:
+    """Store body as fresh for `ttl` seconds, kept `stale_ttl` seconds longer."""
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "body": body,
+                "fresh_until": time.time() + ttl,
+                "etag": compute_etag(body)
+            })
+            pipe.expire(key, ttl + stale_ttl)
+            await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Cache write failed for %s: %s", key, exc)
+
+
+async def invalidate(*patterns: str) -> None:
+    """
+    Delete cached entries.
+
+    Args:
+        patterns: Exact keys or glob patterns (e.g. "domain:1:*")
+    """
+    try:
+        redis = get_redis()
+        keys = []
+        for pattern in patterns:
+            if "*" in pattern:
+                keys.extend([key async for key in redis.scan_iter(match=pattern)])
+            else:
+                keys.append(pattern)
+        if keys:
+            await redis.delete(*keys)
+    except RedisError as exc:
+        logger.warning("Cache invalidation failed for %s: %s", patterns, exc)
+
+
+async def _acquire_refresh_lock(key: str, timeout: int) -> bool:
+    """Ensure only one worker refreshes a stale entry at a time."""
+    try:
+        return bool(await get_redis().set(f"{key}:refresh", 1, nx=True, ex=timeout))
+    except RedisError:
+        return False
+
+
+async def _refresh(func: Callable, key: str, kwargs: dict[str, Any], ttl: int, stale_ttl: int) -> None:
+    """Recompute a stale entry using its own database session."""
+    try:
+        async with AsyncSessionLocal(bind=get_async_engine()) as db:
+            response = await func(**{**kwargs, "db": db})
+        if response.status_code == 200:
+            await set_cached(key, response.body, ttl, stale_ttl)
+    except Exception:
+        logger.exception("Background cache refresh failed for %s", key)
+
+
+def cache_swr(key_fn: Callable[..., str], ttl: int, stale_ttl: int):
+    """
+    Cache an endpoint's JSON response in Redis with stale-while-revalidate.
+
+    The endpoint must return a Response with a serialized body (e.g.
+    ORJSONResponse) and take its database session as the `db` keyword.
+    Only 200 responses are cached; raised errors pass through uncached.
+    Responses carry an ETag, and a matching If-None-Match gets a 304.
+
+    Args:
+        key_fn: Builds the cache key from the endpoint's keyword arguments
+        ttl: Seconds an entry is served as fresh
+        stale_ttl: Extra seconds a stale entry is served while refreshing
+
+    Usage:
+        @router.get("/{domain_id}")
+        @cache_swr(key_fn=lambda **kw: f"domain:{kw['domain_id']}:detail", ttl=300, stale_ttl=60)
+        async def get_domain_details(domain_id: int, db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            request: Request = kwargs.pop("cache_request")
+            if_none_match = request.headers.get("if-none-match")
+            key = key_fn(**kwargs)
+
+            cached = await get_cached(key)
+            if cached is not None:
+                body, fresh_until, etag = cached
+                cache_status = "HIT"
+                if fresh_until <= time.time():
+                    cache_status = "STALE"
+                    if await _acquire_refresh_lock(key, stale_ttl):
+                        task = asyncio.create_task(_refresh(func, key, kwargs, ttl, stale_ttl))
+                        _background_tasks.add(task)
+                        task.add_done_callback(_background_tasks.discard)
+                headers = {"ETag": etag, "X-Cache": cache_status}
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=body, media_type="application/json", headers=headers)
+
+            response = await func(**kwargs)
+            response.headers["X-Cache"] = "MISS"
+            if response.status_code == 200:
+                await set_cached(key, response.body, ttl, stale_ttl)
+                etag = compute_etag(response.body)
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag, "X-Cache": "MISS"})
+                response.headers["ETag"] = etag
+            return response
+
+        # Expose the Request to FastAPI so If-None-Match can be read
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        ])
+        return wrapper
+
+    return decorator
@@ -0,0 +1,86 @@
+"""
+Product service - Batched product writes.
+
+Crawled products are keyed by url_hash. upsert_products() writes a batch
+with one INSERT ... ON CONFLICT (url_hash) DO UPDATE instead of a
+SELECT-then-INSERT/UPDATE per product; rows whose content hash is unchanged
+are left untouched (no row version or index writes).
+"""
+
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.core.models import Product
+from src.utils.url_utils import compute_url_hashes
+
+
+# Scraped fields written on insert and refreshed on a content change
+# (Product.update_from_dict's fields)
+PRODUCT_FIELDS = (
+    "product_name", "description", "price", "currency",
+    "availability", "rating", "review_count",
+    "brand", "category", "sku", "extra_attributes"
+)
+
+_products = Product.__table__
+_CURRENCY_DEFAULT = _products.c.currency.default.arg
+
+_insert = insert(_products)
+
+# Compiled once and run executemany (batched into multi-row VALUES)
+_UPSERT = _insert.on_conflict_do_update(
+    index_elements=[_products.c.url_hash],
+    set_={
+        **{field: _insert.excluded[field] for field in PRODUCT_FIELDS},
+        "content_hash": _insert.excluded.content_hash,
+        "updated_at": _insert.excluded.updated_at
+    },
+    where=_products.c.content_hash.is_distinct_from(_insert.excluded.content_hash)
+)
+
+
+def upsert_products(db: Session, domain_id: int, rows: list[dict], crawl_task_id: Optional[int] = None) -> int:
+    """
+    Insert new products and update changed ones in one batched statement.
+
+    Existing products (same URL) are updated only when their content hash
+    (CONTENT_HASH_FIELDS) differs; their domain and originating crawl task
+    are kept. If a URL repeats within the batch, its last row wins. The
+    caller commits.
+
+    Args:
+        db: Sync database session
+        domain_id: Source domain
+        rows: Scraped products: "url" plus any PRODUCT_FIELDS ("product_name"
+            is required; missing fields are stored as NULL, currency as
+            its default)
+        crawl_task_id: Crawl task that scraped the batch
+
+    Returns:
+        Number of distinct products submitted
+    """
+    if not rows:
+        return 0
+
+    # Last occurrence per URL: a conflict key may appear once per statement
+    by_hash = dict(zip(compute_url_hashes([row["url"] for row in rows]), rows))
+    rows = list(by_hash.values())
+
+    params = []
+    for url_hash, content_hash, row in zip(by_hash, Product.bulk_content_hash(rows), rows):
+        values = {field: row.get(field) for field in PRODUCT_FIELDS}
+        if values["currency"] is None:
+            values["currency"] = _CURRENCY_DEFAULT
+        values.update(
+            domain_id=domain_id,
+            crawl_task_id=crawl_task_id,
+            url=row["url"],
+            url_hash=url_hash,
+            content_hash=content_hash
+        )
+        params.append(values)
+
+    db.execute(_UPSERT, params)
+    return len(params)
@@ -0,0 +1,305 @@
+"""
+Proxy service - Proxy selection and buffered health tracking.
+
+pick_proxy() hands out a domain's least recently used proxy. Crawl workers
+report every proxied request; recording each one through
+Proxy.record_success()/record_failure() costs an UPDATE per request, so
+ProxyStatsBuffer accumulates outcomes in memory and writes them with one
+executemany UPDATE per table on flush.
+
+Hot statements are built once at import with bindparam() placeholders, so
+each call is a compiled-cache hit.
+"""
+
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, Float, Integer, and_, bindparam, case, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.database import utc_now
+from src.core.models import DomainProxy, Proxy
+
+
+# Share of the previous response-time average kept per sample (EWMA, as in
+# the model record_success methods)
+EWMA_KEEP = 7 / 8
+
+# Consecutive failures before a domain-proxy mapping is disabled
+# (as in DomainProxy.record_failure)
+DOMAIN_PROXY_FAILURE_THRESHOLD = 5
+
+
+# Least recently used active mapping for a domain (never-used first), skipping
+# rows another worker is picking; marks it used in the same statement
+_LRU_PICK = (
+    update(DomainProxy)
+    .where(
+        DomainProxy.id == (
+            select(DomainProxy.id)
+            .join(Proxy, Proxy.id == DomainProxy.proxy_id)
+            .where(
+                DomainProxy.domain_id == bindparam("b_domain_id"),
+                DomainProxy.is_active.is_(True),
+                Proxy.is_active.is_(True)
+            )
+            .order_by(DomainProxy.priority, DomainProxy.last_used_at.asc().nulls_first())
+            .limit(1)
+            .with_for_update(of=DomainProxy, skip_locked=True)
+            .scalar_subquery()
+        )
+    )
+    .values(last_used_at=bindparam("b_now"))
+    .returning(DomainProxy.proxy_id)
+)
+
+
+def pick_proxy(db: Session, domain_id: int) -> Optional[Proxy]:
+    """
+    Pick the proxy to use next for a domain and mark its mapping as used.
+
+    Mappings are ordered by priority, then least recently used. The caller
+    commits (the mapping row stays locked until then).
+
+    Args:
+        db: Sync database session
+        domain_id: Domain to crawl
+
+    Returns:
+        Proxy, or None if the domain has no active proxy available
+    """
+    proxy_id = db.execute(
+        _LRU_PICK,
+        {"b_domain_id": domain_id, "b_now": utc_now()},
+        execution_options={"synchronize_session": False}
+    ).scalar()
+    if proxy_id is None:
+        return None
+    return db.get(Proxy, proxy_id)
+
+
+class _Stats:
+    """Outcomes recorded for one proxy (or domain-proxy mapping) since the last flush."""
+
+    __slots__ = (
+        "successes", "failures", "reset",
+        "avg_response_time_ms", "avg_decay", "avg_contribution",
+        "last_used_at", "last_success_at", "last_failure_at"
+    )
+
+    def __init__(self):
+        self.successes = 0
+        # Failures since the last success (or since the last flush)
+        self.failures = 0
+        # A success was recorded, so the stored consecutive-failure count resets
+        self.reset = False
+        # EWMA of the buffered samples alone (used when none is stored yet)
+        self.avg_response_time_ms: Optional[float] = None
+        # Stored EWMA after the buffered samples: stored * avg_decay + avg_contribution
+        self.avg_decay = 1.0
+        self.avg_contribution = 0.0
+        self.last_used_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.last_failure_at: Optional[datetime] = None
+
+    def add_success(self, response_time_ms: int, now: datetime) -> None:
+        self.successes += 1
+        self.failures = 0
+        self.reset = True
+        if self.avg_response_time_ms is None:
+            self.avg_response_time_ms = response_time_ms
+        else:
+            self.avg_response_time_ms = (
+                self.avg_response_time_ms * EWMA_KEEP + response_time_ms * (1 - EWMA_KEEP)
+            )
+        self.avg_decay *= EWMA_KEEP
+        self.avg_contribution = (
+            self.avg_contribution * EWMA_KEEP + response_time_ms * (1 - EWMA_KEEP)
+        )
+        self.last_used_at = now
+        self.last_success_at = now
+
+    def add_failure(self, now: datetime) -> None:
+        self.failures += 1
+        self.last_used_at = now
+        self.last_failure_at = now
+
+
+def _consecutive_failures(table):
+    """New consecutive-failure count: reset by a buffered success, else accumulated."""
+    return case(
+        (bindparam("b_reset", type_=Boolean), bindparam("b_failures")),
+        else_=table.c.failure_count + bindparam("b_failures")
+    )
+
+
+def _avg_response_time(table):
+    """Apply the buffered samples to the stored EWMA (seeded by them if unset)."""
+    stored = table.c.avg_response_time_ms
+    return case(
+        (stored.is_(None), bindparam("b_avg", type_=Integer)),
+        else_=cast(
+            func.round(stored * bindparam("b_avg_decay", type_=Float) + bindparam("b_avg_contribution", type_=Float)),
+            Integer
+        )
+    )
+
+
+def _is_active(table, reenable: bool):
+    """
+    Disable at the failure threshold, else keep the stored flag. With
+    reenable (as in Proxy.record_success) a buffered success turns it on.
+    """
+    whens = [(_consecutive_failures(table) >= bindparam("b_threshold"), False)]
+    if reenable:
+        whens.append((bindparam("b_reset", type_=Boolean), True))
+    return case(*whens, else_=table.c.is_active)
+
+
+_proxies = Proxy.__table__
+_domain_proxies = DomainProxy.__table__
+
+# Per-proxy update; compiled once and run executemany on flush
+_PROXY_UPDATE = (
+    update(_proxies)
+    .where(_proxies.c.id == bindparam("b_proxy_id"))
+    .values(
+        success_count=_proxies.c.success_count + bindparam("b_successes"),
+        failure_count=_consecutive_failures(_proxies),
+        avg_response_time_ms=_avg_response_time(_proxies),
+        last_used_at=bindparam("b_last_used_at"),
+        last_success_at=func.coalesce(bindparam("b_last_success_at"), _proxies.c.last_success_at),
+        last_failure_at=func.coalesce(bindparam("b_last_failure_at"), _proxies.c.last_failure_at),
+        is_active=_is_active(_proxies, reenable=True)
+    )
+)
+
+# Per-mapping update for the domain-proxy pair
+_DOMAIN_PROXY_UPDATE = (
+    update(_domain_proxies)
+    .where(
+        and_(
+            _domain_proxies.c.domain_id == bindparam("b_domain_id"),
+            _domain_proxies.c.proxy_id == bindparam("b_proxy_id")
+        )
+    )
+    .values(
+        success_count=_domain_proxies.c.success_count + bindparam("b_successes"),
+        failure_count=_consecutive_failures(_domain_proxies),
+        avg_response_time_ms=_avg_response_time(_domain_proxies),
+        last_used_at=bindparam("b_last_used_at"),
+        is_active=_is_active(_domain_proxies, reenable=False)
+    )
+)
+
+
+def _params(stats: _Stats, threshold: int) -> dict:
+    """Bind parameters shared by both UPDATE statements."""
+    return {
+        "b_threshold": threshold,
+        "b_successes": stats.successes,
+        "b_failures": stats.failures,
+        "b_reset": stats.reset,
+        "b_avg": None if stats.avg_response_time_ms is None else round(stats.avg_response_time_ms),
+        "b_avg_decay": stats.avg_decay,
+        "b_avg_contribution": stats.avg_contribution,
+        "b_last_used_at": stats.last_used_at,
+        "b_last_success_at": stats.last_success_at,
+        "b_last_failure_at": stats.last_failure_at
+    }
+
+
+class ProxyStatsBuffer:
+    """
+    In-memory accumulator for proxy request outcomes.
+
+    Applies the same rules as Proxy/DomainProxy.record_success() and
+    record_failure() (success resets the consecutive-failure count,
+    reaching the failure threshold disables, and a success re-enables a
+    proxy but never a domain-proxy mapping), but writes them in batches,
+    including the response-time EWMA over every buffered sample.
+    Thread-safe; call flush() periodically.
+
+    Usage:
+        from src.services.proxy_service import proxy_stats
+
+        proxy_stats.record_success(proxy_id, domain_id, response_time_ms=420)
+        proxy_stats.record_failure(proxy_id, domain_id)
+
+        with SessionLocal(bind=get_engine()) as db:
+            proxy_stats.flush(db)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proxies: dict[int, _Stats] = {}
+        self._domain_proxies: dict[tuple[int, int], _Stats] = {}
+
+    def _entries(self, proxy_id: int, domain_id: int) -> tuple[_Stats, _Stats]:
+        proxy = self._proxies.get(proxy_id)
+        if proxy is None:
+            proxy = self._proxies[proxy_id] = _Stats()
+        mapping = self._domain_proxies.get((domain_id, proxy_id))
+        if mapping is None:
+            mapping = self._domain_proxies[(domain_id, proxy_id)] = _Stats()
+        return proxy, mapping
+
+    def record_success(self, proxy_id: int, domain_id: int, response_time_ms: int) -> None:
+        """Record a successful request through proxy_id for domain_id."""
+        now = utc_now()
+        with self._lock:
+            for stats in self._entries(proxy_id, domain_id):
+                stats.add_success(response_time_ms, now)
+
+    def record_failure(self, proxy_id: int, domain_id: int) -> None:
+        """Record a failed request through proxy_id for domain_id."""
+        now = utc_now()
+        with self._lock:
+            for stats in self._entries(proxy_id, domain_id):
+                stats.add_failure(now)
+
+    def __len__(self) -> int:
+        return len(self._domain_proxies)
+
+    def flush(self, db: Session) -> int:
+        """
+        Write buffered outcomes and commit.
+
+        Args:
+            db: Sync database session
+
+        Returns:
+            Number of domain-proxy mappings written
+        """
+        with self._lock:
+            proxies, self._proxies = self._proxies, {}
+            domain_proxies, self._domain_proxies = self._domain_proxies, {}
+        if not domain_proxies:
+            return 0
+
+        proxy_threshold = get_settings().proxy_failure_threshold
+
+        # Core executemany on the session's connection (one UPDATE per table)
+        connection = db.connection()
+        connection.execute(
+            _PROXY_UPDATE,
+            [
+                {"b_proxy_id": proxy_id, **_params(stats, proxy_threshold)}
+                for proxy_id, stats in proxies.items()
+            ]
+        )
+        connection.execute(
+            _DOMAIN_PROXY_UPDATE,
+            [
+                {"b_domain_id": domain_id, "b_proxy_id": proxy_id, **_params(stats, DOMAIN_PROXY_FAILURE_THRESHOLD)}
+                for (domain_id, proxy_id), stats in domain_proxies.items()
+            ]
+        )
+        db.commit()
+        return len(domain_proxies)
+
+
+# Process-wide buffer used by crawl workers
+proxy_stats = ProxyStatsBuffer()
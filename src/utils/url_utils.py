@@ -0,0 +1,29 @@
+"""
+URL utilities - Hashing for deduplication keys.
+"""
+
+import xxhash
+
+
+def compute_url_hash(url: str) -> bytes:
+    """
+    Compute the deduplication key for a URL.
+
+    Uses 128-bit xxh3: the hash only keys unique indexes (it is not a
+    security boundary), so a fast non-cryptographic hash is sufficient.
+
+    Returns:
+        16-byte raw digest (render with .hex() in API responses)
+    """
+    return xxhash.xxh3_128_digest(url.encode('utf-8'))
+
+
+def compute_url_hashes(urls: list[str]) -> list[bytes]:
+    """
+    Compute deduplication keys for many URLs (same keys as compute_url_hash).
+
+    xxh3 already vectorizes each digest (SSE2/AVX2), so batches are bound by
+    per-call Python overhead; this keeps the loop to one C call per URL.
+    """
+    digest = xxhash.xxh3_128_digest
+    return [digest(url.encode('utf-8')) for url in urls]
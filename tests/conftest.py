@@ -0,0 +1,71 @@
+"""
+Shared fixtures.
+
+Database-backed tests run against the configured DATABASE_URL (migrated
+schema) and are skipped when PostgreSQL is unreachable. Rows they create
+are deleted on teardown.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import OperationalError
+
+from src.core.database import SessionLocal, get_engine
+from src.core.models import Domain, DomainProxy, Proxy
+
+
+@pytest.fixture
+def db():
+    """Sync database session; skips the test if PostgreSQL is unreachable."""
+    try:
+        with get_engine().connect():
+            pass
+    except OperationalError as exc:
+        pytest.skip(f"PostgreSQL unavailable: {exc}")
+    with SessionLocal(bind=get_engine()) as session:
+        yield session
+
+
+@pytest.fixture
+def make_domain(db):
+    """Factory for a committed Domain with `proxies` DomainProxy mappings."""
+    domain_ids, proxy_ids = [], []
+
+    def factory(proxies: int = 1, **domain_fields) -> tuple[Domain, list[DomainProxy]]:
+        name = f"test-{uuid.uuid4().hex[:12]}.example"
+        domain = Domain(
+            domain_name=name,
+            base_url=f"https://{name}",
+            parser_name="test",
+            **domain_fields
+        )
+        db.add(domain)
+        db.flush()
+        domain_ids.append(domain.id)
+
+        mappings = []
+        for index in range(proxies):
+            proxy = Proxy(
+                proxy_url=f"10.{index // 256}.{index % 256}.{len(proxy_ids) % 256}",
+                proxy_port=20000 + len(proxy_ids),
+                country_code="US" if index % 2 else "DE"
+            )
+            db.add(proxy)
+            db.flush()
+            proxy_ids.append(proxy.id)
+            mapping = DomainProxy(domain_id=domain.id, proxy_id=proxy.id, priority=1)
+            db.add(mapping)
+            mappings.append(mapping)
+        db.commit()
+        return domain, mappings
+
+    yield factory
+
+    db.rollback()
+    if proxy_ids:
+        db.execute(delete(Proxy).where(Proxy.id.in_(proxy_ids)))
+    if domain_ids:
+        db.execute(delete(Domain).where(Domain.id.in_(domain_ids)))
+    db.commit()
@@ -0,0 +1,44 @@
+"""
+API test fixtures.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src.api.main import app
+from src.core.database import get_async_engine
+from src.services import cache_service
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """Test client with the response cache bypassed (every request hits the handler)."""
+    async def cache_miss(key):
+        return None
+
+    async def skip_store(key, body, ttl, stale_ttl):
+        return None
+
+    monkeypatch.setattr(cache_service, "get_cached", cache_miss)
+    monkeypatch.setattr(cache_service, "set_cached", skip_store)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements the API's async engine executes."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,43 @@
+"""
+Tests for the domain-proxy routes.
+"""
+
+import pytest
+
+from tests.test_api.conftest import count_queries
+
+
+pytestmark = pytest.mark.integration
+
+
+class TestStatementCount:
+    """Endpoints stay within their statement budget however many proxies a domain has."""
+
+    @pytest.mark.parametrize("proxies", [1, 12])
+    def test_list_domain_proxies(self, client, make_domain, proxies):
+        domain, _ = make_domain(proxies=proxies)
+
+        with count_queries() as statements:
+            response = client.get(f"/api/admin/domains/{domain.id}/proxies")
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]["proxies"]) == proxies
+        assert 0 < len(statements) <= 2, statements
+
+    @pytest.mark.parametrize("proxies", [1, 12])
+    def test_get_domain_proxy_stats(self, client, make_domain, proxies):
+        domain, _ = make_domain(proxies=proxies)
+
+        with count_queries() as statements:
+            response = client.get(f"/api/admin/domains/{domain.id}/proxies/stats")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["total_proxies"] == proxies
+        assert 0 < len(statements) <= 2, statements
+
+    def test_list_domain_proxies_missing_domain(self, client, db):
+        with count_queries() as statements:
+            response = client.get("/api/admin/domains/0/proxies")
+
+        assert response.status_code == 404
+        assert len(statements) == 1, statements
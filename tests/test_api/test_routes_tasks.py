@@ -0,0 +1,104 @@
+"""
+Tests for the crawl task routes.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from src.core.models import CrawlTask
+
+
+pytestmark = pytest.mark.integration
+
+# Valid domain ID that no test row uses
+MISSING_DOMAIN_ID = 2 ** 31 - 1
+
+
+def _url(path: str) -> str:
+    return f"https://bulk-{uuid.uuid4().hex[:12]}.example/{path}"
+
+
+class TestCreateCrawlTasksBulk:
+    """Per-item statuses of POST /tasks/bulk."""
+
+    @staticmethod
+    def _post(client, tasks: list[dict]) -> dict:
+        response = client.post("/api/admin/tasks/bulk", json={"tasks": tasks})
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    def test_new_urls_are_created(self, client, db, make_domain):
+        domain, _ = make_domain(proxies=0)
+        urls = [_url("a"), _url("b")]
+
+        data = self._post(client, [{"domain_id": domain.id, "url": url} for url in urls])
+
+        assert (data["created"], data["duplicates"], data["errors"]) == (2, 0, 0)
+        assert [result["status"] for result in data["results"]] == ["created", "created"]
+        assert [result["index"] for result in data["results"]] == [0, 1]
+        stored = dict(db.execute(
+            select(CrawlTask.url, CrawlTask.id).where(CrawlTask.domain_id == domain.id)
+        ).all())
+        assert [result["task_id"] for result in data["results"]] == [stored[url] for url in urls]
+
+    def test_missing_domain(self, client, make_domain):
+        domain, _ = make_domain(proxies=0)
+
+        data = self._post(client, [
+            {"domain_id": MISSING_DOMAIN_ID, "url": _url("a")},
+            {"domain_id": domain.id, "url": _url("b")}
+        ])
+
+        missing, created = data["results"]
+        assert missing["status"] == "error"
+        assert missing["error"]["code"] == "DOMAIN_NOT_FOUND"
+        assert "task_id" not in missing
+        assert created["status"] == "created"
+        assert (data["created"], data["errors"]) == (1, 1)
+
+    def test_inactive_domain(self, client, db, make_domain):
+        domain, _ = make_domain(proxies=0, is_active=False)
+
+        data = self._post(client, [{"domain_id": domain.id, "url": _url("a")}])
+
+        (result,) = data["results"]
+        assert result["status"] == "error"
+        assert result["error"]["code"] == "DOMAIN_INACTIVE"
+        assert db.scalar(select(CrawlTask.id).where(CrawlTask.domain_id == domain.id)) is None
+
+    def test_repeat_within_batch(self, client, make_domain):
+        domain, _ = make_domain(proxies=0)
+        url = _url("a")
+
+        data = self._post(client, [
+            {"domain_id": domain.id, "url": url},
+            {"domain_id": domain.id, "url": url}
+        ])
+
+        first, repeat = data["results"]
+        assert first["status"] == "created"
+        assert repeat["status"] == "duplicate"
+        assert repeat["existing_task_id"] == first["task_id"]
+        assert (data["created"], data["duplicates"]) == (1, 1)
+
+    def test_repeat_of_existing_task(self, client, make_domain):
+        domain, _ = make_domain(proxies=0)
+        url = _url("a")
+        (first,) = self._post(client, [{"domain_id": domain.id, "url": url}])["results"]
+
+        data = self._post(client, [
+            {"domain_id": domain.id, "url": url},
+            {"domain_id": domain.id, "url": url},
+            {"domain_id": domain.id, "url": _url("b")}
+        ])
+
+        existing, repeat, created = data["results"]
+        assert existing["status"] == "duplicate"
+        assert existing["existing_task_id"] == first["task_id"]
+        assert repeat["status"] == "duplicate"
+        assert repeat["existing_task_id"] == first["task_id"]
+        assert created["status"] == "created"
+        assert created["task_id"] != first["task_id"]
+        assert (data["created"], data["duplicates"], data["errors"]) == (1, 2, 0)
@@ -0,0 +1,97 @@
+"""
+Tests for the batched product upsert.
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from src.core.models import Product
+from src.services.product_service import upsert_products
+
+
+pytestmark = pytest.mark.integration
+
+
+def _url(path: str) -> str:
+    return f"https://shop-{uuid.uuid4().hex[:12]}.example/{path}"
+
+
+def _stored(db, url: str):
+    """Current row for url, read fresh from the database."""
+    db.expire_all()
+    return db.execute(
+        select(
+            Product.id,
+            Product.product_name,
+            Product.price,
+            Product.currency,
+            Product.content_hash,
+            Product.updated_at
+        ).where(Product.url == url)
+    ).one()
+
+
+class TestUpsertProducts:
+
+    def test_inserts_new_rows(self, db, make_domain):
+        domain, _ = make_domain(proxies=0)
+        rows = [
+            {"url": _url("a"), "product_name": "Kettle", "price": Decimal("19.99")},
+            {"url": _url("b"), "product_name": "Toaster", "currency": "EUR"}
+        ]
+
+        assert upsert_products(db, domain.id, rows) == 2
+        db.commit()
+
+        kettle = _stored(db, rows[0]["url"])
+        assert (kettle.product_name, kettle.price, kettle.currency) == ("Kettle", Decimal("19.99"), "USD")
+        assert kettle.content_hash == Product.bulk_content_hash([rows[0]])[0]
+        toaster = _stored(db, rows[1]["url"])
+        assert (toaster.product_name, toaster.price, toaster.currency) == ("Toaster", None, "EUR")
+
+    def test_unchanged_rows_are_left_untouched(self, db, make_domain):
+        domain, _ = make_domain(proxies=0)
+        row = {"url": _url("a"), "product_name": "Kettle", "price": Decimal("19.99")}
+        upsert_products(db, domain.id, [row])
+        db.commit()
+        before = _stored(db, row["url"])
+
+        upsert_products(db, domain.id, [dict(row)])
+        db.commit()
+
+        assert _stored(db, row["url"]) == before
+
+    def test_changed_row_is_updated(self, db, make_domain):
+        domain, _ = make_domain(proxies=0)
+        url = _url("a")
+        upsert_products(db, domain.id, [{"url": url, "product_name": "Kettle", "price": Decimal("19.99")}])
+        db.commit()
+        before = _stored(db, url)
+
+        changed = {"url": url, "product_name": "Kettle", "price": Decimal("17.49")}
+        upsert_products(db, domain.id, [changed])
+        db.commit()
+
+        after = _stored(db, url)
+        assert after.id == before.id
+        assert after.price == Decimal("17.49")
+        assert after.content_hash == Product.bulk_content_hash([changed])[0]
+        assert after.content_hash != before.content_hash
+        assert after.updated_at > before.updated_at
+
+    def test_last_row_wins_for_repeated_url(self, db, make_domain):
+        domain, _ = make_domain(proxies=0)
+        url = _url("a")
+
+        submitted = upsert_products(db, domain.id, [
+            {"url": url, "product_name": "Old name", "price": Decimal("1.00")},
+            {"url": url, "product_name": "New name", "price": Decimal("2.00")}
+        ])
+        db.commit()
+
+        assert submitted == 1
+        stored = _stored(db, url)
+        assert (stored.product_name, stored.price) == ("New name", Decimal("2.00"))
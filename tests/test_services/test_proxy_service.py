@@ -0,0 +1,245 @@
+"""
+Tests for the buffered proxy stats recorder.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import select, update
+
+from src.core.config import get_settings
+from src.core.models import DomainProxy, Proxy
+from src.services.proxy_service import (
+    DOMAIN_PROXY_FAILURE_THRESHOLD,
+    EWMA_KEEP,
+    ProxyStatsBuffer,
+    _DOMAIN_PROXY_UPDATE,
+    _PROXY_UPDATE,
+    _Stats,
+    _params,
+)
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class TestStats:
+    """_Stats accumulation."""
+
+    def test_success_resets_consecutive_failures(self):
+        stats = _Stats()
+        stats.add_failure(NOW)
+        stats.add_failure(NOW)
+        stats.add_success(100, NOW)
+
+        assert stats.failures == 0
+        assert stats.successes == 1
+        assert stats.reset is True
+
+    def test_failures_after_success_accumulate_from_zero(self):
+        stats = _Stats()
+        stats.add_success(100, NOW)
+        stats.add_failure(NOW)
+        stats.add_failure(NOW)
+
+        assert stats.failures == 2
+        assert stats.successes == 1
+        assert stats.reset is True
+
+    def test_failures_only_do_not_reset(self):
+        stats = _Stats()
+        for _ in range(3):
+            stats.add_failure(NOW)
+
+        assert stats.failures == 3
+        assert stats.successes == 0
+        assert stats.reset is False
+        assert stats.avg_response_time_ms is None
+        assert stats.last_success_at is None
+        assert stats.last_failure_at == NOW
+
+    def test_sample_counts_and_ewma(self):
+        stats = _Stats()
+        for response_time_ms in (100, 200, 300):
+            stats.add_success(response_time_ms, NOW)
+
+        assert stats.successes == 3
+        assert stats.avg_decay == pytest.approx(EWMA_KEEP ** 3)
+
+        expected = 100
+        for response_time_ms in (200, 300):
+            expected = expected * EWMA_KEEP + response_time_ms * (1 - EWMA_KEEP)
+        assert stats.avg_response_time_ms == pytest.approx(expected)
+
+    def test_avg_decay_and_contribution_apply_to_stored_average(self):
+        stats = _Stats()
+        for response_time_ms in (100, 200):
+            stats.add_success(response_time_ms, NOW)
+
+        stored = 400
+        expected = stored
+        for response_time_ms in (100, 200):
+            expected = expected * EWMA_KEEP + response_time_ms * (1 - EWMA_KEEP)
+        assert stored * stats.avg_decay + stats.avg_contribution == pytest.approx(expected)
+
+
+class TestParams:
+    """Bind parameters for the executemany rows."""
+
+    def test_params_for_success(self):
+        stats = _Stats()
+        stats.add_failure(NOW)
+        stats.add_success(101, NOW)
+        stats.add_success(102, NOW)
+
+        params = _params(stats, threshold=7)
+
+        assert params["b_threshold"] == 7
+        assert params["b_successes"] == 2
+        assert params["b_failures"] == 0
+        assert params["b_reset"] is True
+        assert params["b_avg"] == round(stats.avg_response_time_ms)
+        assert params["b_avg_decay"] == pytest.approx(EWMA_KEEP ** 2)
+        assert params["b_last_success_at"] == NOW
+
+    def test_params_for_failures_only(self):
+        stats = _Stats()
+        stats.add_failure(NOW)
+
+        params = _params(stats, threshold=5)
+
+        assert params["b_reset"] is False
+        assert params["b_failures"] == 1
+        assert params["b_avg"] is None
+        assert params["b_avg_decay"] == 1.0
+        assert params["b_avg_contribution"] == 0.0
+        assert params["b_last_success_at"] is None
+        assert params["b_last_failure_at"] == NOW
+
+    def test_flush_rows_per_table(self):
+        buffer = ProxyStatsBuffer()
+        buffer.record_success(proxy_id=1, domain_id=10, response_time_ms=100)
+        buffer.record_failure(proxy_id=1, domain_id=20)
+        buffer.record_failure(proxy_id=2, domain_id=10)
+        assert len(buffer) == 3
+
+        db = MagicMock()
+        assert buffer.flush(db) == 3
+        assert len(buffer) == 0
+
+        connection = db.connection.return_value
+        (proxy_call, mapping_call) = connection.execute.call_args_list
+        statement, proxy_rows = proxy_call.args
+        assert statement is _PROXY_UPDATE
+        statement, mapping_rows = mapping_call.args
+        assert statement is _DOMAIN_PROXY_UPDATE
+        db.commit.assert_called_once()
+
+        proxies = {row["b_proxy_id"]: row for row in proxy_rows}
+        assert proxies[1]["b_threshold"] == get_settings().proxy_failure_threshold
+        # The success came first, so the later failure counts from zero
+        assert proxies[1]["b_reset"] is True
+        assert proxies[1]["b_successes"] == 1
+        assert proxies[1]["b_failures"] == 1
+        assert proxies[1]["b_avg_decay"] == pytest.approx(EWMA_KEEP)
+        assert proxies[2]["b_reset"] is False
+        assert proxies[2]["b_avg_decay"] == 1.0
+
+        mappings = {(row["b_domain_id"], row["b_proxy_id"]): row for row in mapping_rows}
+        assert set(mappings) == {(10, 1), (20, 1), (10, 2)}
+        assert all(row["b_threshold"] == DOMAIN_PROXY_FAILURE_THRESHOLD for row in mapping_rows)
+        assert mappings[(10, 1)]["b_reset"] is True
+        assert mappings[(20, 1)]["b_reset"] is False
+        assert mappings[(20, 1)]["b_failures"] == 1
+
+    def test_flush_empty_buffer_skips_database(self):
+        db = MagicMock()
+        assert ProxyStatsBuffer().flush(db) == 0
+        db.connection.assert_not_called()
+        db.commit.assert_not_called()
+
+
+class TestThresholds:
+    """The buffer disables mappings where DomainProxy.record_failure() does."""
+
+    def test_domain_proxy_threshold_matches_model(self):
+        below = DomainProxy(failure_count=DOMAIN_PROXY_FAILURE_THRESHOLD - 2, is_active=True)
+        below.record_failure()
+        assert below.is_active is True
+
+        at = DomainProxy(failure_count=DOMAIN_PROXY_FAILURE_THRESHOLD - 1, is_active=True)
+        at.record_failure()
+        assert at.is_active is False
+
+
+@pytest.mark.integration
+class TestFlushIsActive:
+    """is_active as written by the flushed UPDATEs."""
+
+    @staticmethod
+    def _is_active(db, mapping: DomainProxy) -> tuple[bool, bool]:
+        proxy_active = db.scalar(select(Proxy.is_active).where(Proxy.id == mapping.proxy_id))
+        mapping_active = db.scalar(select(DomainProxy.is_active).where(DomainProxy.id == mapping.id))
+        return proxy_active, mapping_active
+
+    @staticmethod
+    def _disable(db, mapping: DomainProxy) -> None:
+        db.execute(update(Proxy).where(Proxy.id == mapping.proxy_id).values(is_active=False))
+        db.execute(update(DomainProxy).where(DomainProxy.id == mapping.id).values(is_active=False))
+        db.commit()
+
+    def test_success_reenables_proxy_but_not_mapping(self, db, make_domain):
+        domain, (mapping,) = make_domain()
+        self._disable(db, mapping)
+
+        buffer = ProxyStatsBuffer()
+        buffer.record_success(mapping.proxy_id, domain.id, response_time_ms=100)
+        buffer.flush(db)
+
+        assert self._is_active(db, mapping) == (True, False)
+
+    def test_mapping_disables_at_its_threshold(self, db, make_domain):
+        domain, (mapping,) = make_domain()
+
+        buffer = ProxyStatsBuffer()
+        for _ in range(DOMAIN_PROXY_FAILURE_THRESHOLD - 1):
+            buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+        assert self._is_active(db, mapping) == (True, True)
+
+        buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+        assert self._is_active(db, mapping) == (True, False)
+
+    def test_proxy_disables_at_its_threshold(self, db, make_domain):
+        domain, (mapping,) = make_domain()
+        threshold = get_settings().proxy_failure_threshold
+
+        buffer = ProxyStatsBuffer()
+        for _ in range(threshold - 1):
+            buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+        assert self._is_active(db, mapping)[0] is True
+
+        buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+        assert self._is_active(db, mapping)[0] is False
+
+    def test_success_resets_stored_failures(self, db, make_domain):
+        domain, (mapping,) = make_domain()
+
+        buffer = ProxyStatsBuffer()
+        for _ in range(DOMAIN_PROXY_FAILURE_THRESHOLD - 1):
+            buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+        buffer.record_success(mapping.proxy_id, domain.id, response_time_ms=80)
+        buffer.record_failure(mapping.proxy_id, domain.id)
+        buffer.flush(db)
+
+        failure_count, success_count, avg = db.execute(
+            select(DomainProxy.failure_count, DomainProxy.success_count, DomainProxy.avg_response_time_ms)
+            .where(DomainProxy.id == mapping.id)
+        ).one()
+        assert (failure_count, success_count, avg) == (1, 1, 80)
+        assert self._is_active(db, mapping) == (True, True)